@@ -1,16 +1,17 @@
 import streamlit as st
+from functools import lru_cache
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-from sqlalchemy import create_engine
-from config import DB_CONFIG, CHART_CONFIG
+import connectorx as cx
+from datetime import timedelta
+from sqlalchemy import text
+from config import CHART_CONFIG, APP_CONFIG
+from db_utils import DATABASE_URL, get_engine
 from data_utils import (
-    safe_numeric_conversion, 
     safe_decimal_conversion, 
     format_crypto_value, 
-    format_percentage,
-    safe_calculation,
     validate_dataframe_columns,
     handle_outliers_iqr,
     create_safe_metrics
@@ -24,62 +25,88 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-@st.cache_data
-def load_arb_transaction_data():
+# Numeric arbitrage columns, kept as numpy float64 after loading
+ARB_NUMERIC_COLUMNS = ['buyVolume', 'buyVwap', 'sellVolume', 'sellVwap', 'idealProfit', 'original_idealProfit']
+
+# Percentage return on the buy side, computed by Postgres on typed columns.
+# Each missing input counts as 0; a zero investment yields 0.
+ARB_IDEAL_PROFIT_SQL = """COALESCE(
+                (COALESCE("sellVolume"::double precision, 0) * COALESCE("sellVwap"::double precision, 0)
+                 - COALESCE("buyVolume"::double precision, 0) * COALESCE("buyVwap"::double precision, 0))
+                / NULLIF(COALESCE("buyVolume"::double precision, 0) * COALESCE("buyVwap"::double precision, 0), 0) * 100,
+                0
+            )"""
+
+# Repeated string codes, stored as category to shrink the frames and speed up groupby
+ARB_CATEGORY_COLUMNS = ['sellBase', 'buyExchange', 'sellExchange']
+BTS_CATEGORY_COLUMNS = ['type', 'walletAddress', 'tokenAddress', 'botId']
+
+# Rows per page in the transaction tables
+TABLE_PAGE_SIZE = 500
+
+# Bounds and default for the number of recent trades offered in the trade dropdowns
+DROPDOWN_MIN_TRADES = 100
+DROPDOWN_MAX_TRADES = 5000
+DROPDOWN_DEFAULT_TRADES = 500
+
+@st.cache_resource(ttl=APP_CONFIG["cache_ttl"], max_entries=APP_CONFIG["cache_max_entries"], show_spinner=False)
+def load_arb_transaction_data(selected_month='All'):
     """
     Load arbitrage transaction data from PostgreSQL database.
+
+    Only the selected month (YYYY-MM) is transferred; 'All' loads every trade.
+
+    idealProfit is recalculated by Postgres as the percentage return on the buy
+    side; the value stored in the table is kept as original_idealProfit. Both,
+    like the other ARB_NUMERIC_COLUMNS, are always float64, so callers can use
+    them without further conversion.
+
+    The frame is cached as a shared resource rather than pickled per rerun, so
+    callers must treat it as read-only and copy before adding columns.
+
+    Results may be up to cache_ttl (5 minutes) stale; at most cache_max_entries
+    months are kept in memory.
     """
     try:
-        # Create database connection
-        engine = create_engine(
-            f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@"
-            f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-        )
-        
-        # Load data
-        query = "SELECT * FROM arbtransaction"
+        # Filter by month server-side so only the selected window crosses the wire
+        # (ConnectorX takes no bind parameters, so the bounds are inlined)
+        month_condition, _ = month_sql_condition('"dateTraded"', selected_month, inline=True)
+        
+        # Load only the columns the dashboard uses, computing
+        # (sellVolume*sellVwap - buyVolume*buyVwap) / (buyVolume*buyVwap) * 100
+        # server-side on typed columns. Missing values load as 0; a zero investment yields 0.
+        query = f"""
+        SELECT
+            id,
+            "dateTraded",
+            "sellBase",
+            "buyExchange",
+            "sellExchange",
+            COALESCE("buyVolume"::double precision, 0) AS "buyVolume",
+            COALESCE("buyVwap"::double precision, 0) AS "buyVwap",
+            COALESCE("sellVolume"::double precision, 0) AS "sellVolume",
+            COALESCE("sellVwap"::double precision, 0) AS "sellVwap",
+            {ARB_IDEAL_PROFIT_SQL} AS "idealProfit",
+            COALESCE("idealProfit"::double precision, 0) AS "original_idealProfit"
+        FROM arbtransaction
+        WHERE {month_condition}
+        """
         
-        data = pd.read_sql(query, engine)
+        # ConnectorX decodes the binary protocol straight into Arrow columns instead of
+        # boxing every value as a Python object; Arrow-backed columns avoid object dtype
+        # for strings
+        data = cx.read_sql(DATABASE_URL, query, return_type='arrow').to_pandas(types_mapper=pd.ArrowDtype)
         
-        # Store original idealProfit from database
-        original_idealProfit = data['idealProfit'].copy() if 'idealProfit' in data.columns else pd.Series([0] * len(data))
+        # Keep every numeric column and dateTraded on numpy dtypes: groupby, quantile
+        # and other aggregations on pyarrow-backed columns take a much slower path
+        data = data.astype({col: 'float64' for col in ARB_NUMERIC_COLUMNS})
+        data['dateTraded'] = data['dateTraded'].astype('datetime64[ns]')
         
-        # Calculate idealProfit using the formula: (sellVolume*sellVwap) - (buyVolume*buyVwap)
-        if all(col in data.columns for col in ['sellVolume', 'sellVwap', 'buyVolume', 'buyVwap']):
-            # Convert columns to numeric using robust data utilities
-            data['sellVolume'] = data['sellVolume'].apply(lambda x: safe_numeric_conversion(x))
-            data['sellVwap'] = data['sellVwap'].apply(lambda x: safe_numeric_conversion(x))
-            data['buyVolume'] = data['buyVolume'].apply(lambda x: safe_numeric_conversion(x))
-            data['buyVwap'] = data['buyVwap'].apply(lambda x: safe_numeric_conversion(x))
-            
-            # Calculate raw profit using safe calculations
-            data['raw_profit'] = data.apply(lambda row: safe_calculation(
-                lambda sv, svwap, bv, bvwap: (sv * svwap) - (bv * bvwap),
-                row['sellVolume'], row['sellVwap'], row['buyVolume'], row['buyVwap']
-            ), axis=1)
-            
-            # Calculate total investment (buyVolume * buyVwap)
-            data['total_investment'] = data.apply(lambda row: safe_calculation(
-                lambda bv, bvwap: bv * bvwap,
-                row['buyVolume'], row['buyVwap']
-            ), axis=1)
-            
-            # Convert to percentage (profit as percentage of investment)
-            data['idealProfit'] = data.apply(lambda row: safe_calculation(
-                lambda rp, ti: (rp / ti * 100) if ti != 0 else 0,
-                row['raw_profit'], row['total_investment']
-            ), axis=1)
-            
-            # Store original idealProfit using robust conversion
-            data['original_idealProfit'] = original_idealProfit.apply(lambda x: safe_numeric_conversion(x))
-        else:
-            st.warning("Missing required columns for ideal profit calculation: sellVolume, sellVwap, buyVolume, buyVwap")
-            data['idealProfit'] = 0
-            data['original_idealProfit'] = original_idealProfit
+        # Sort chronologically once so the charts and tables read in time order
+        data = data.sort_values('dateTraded', kind='mergesort', ignore_index=True)
         
-        # Convert dateTraded to datetime
-        if 'dateTraded' in data.columns:
-            data['dateTraded'] = pd.to_datetime(data['dateTraded'])
+        # Store repeated string codes as categories
+        data = data.astype({col: 'category' for col in ARB_CATEGORY_COLUMNS})
         
         return data
         
@@ -87,17 +114,19 @@ def load_arb_transaction_data():
         st.error(f"Error loading data: {str(e)}")
         return pd.DataFrame()
 
-@st.cache_data
-def load_bts_transaction_data():
+@st.cache_data(ttl=APP_CONFIG["bts_cache_ttl"], max_entries=APP_CONFIG["cache_max_entries"], show_spinner=False)
+def load_bts_transaction_data(selected_month='All'):
     """
     Load BTS transaction data from PostgreSQL database with joins to related tables.
+
+    Only the selected month (YYYY-MM) is transferred; 'All' loads every transaction.
+
+    Results may be up to bts_cache_ttl (15 minutes) stale; at most
+    cache_max_entries months are kept in memory.
     """
     try:
-        # Create database connection
-        engine = create_engine(
-            f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@"
-            f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-        )
+        # Reuse the pooled database engine
+        engine = get_engine()
         
         # Load data with joins to get complete information
         query = """
@@ -136,32 +165,47 @@ def load_bts_transaction_data():
         FROM btstransaction bt
         LEFT JOIN btscoininfo bci ON bt."tokenAddress" = bci."tokenAddress"
         LEFT JOIN btsbundle bb ON bt."tokenAddress" = bb."tokenAddress"
+        WHERE {month_condition}
         ORDER BY bt.timestamp DESC
         """
         
-        data = pd.read_sql(query, engine)
+        # Filter by month server-side so only the selected window crosses the wire
+        month_condition, params = month_sql_condition('bt.timestamp', selected_month)
+        
+        # Stream the joined result through a server-side cursor in chunks instead of
+        # buffering every row in the driver before pandas builds the frame
+        with engine.connect().execution_options(stream_results=True) as conn:
+            chunks = pd.read_sql(
+                text(query.format(month_condition=month_condition)), conn, params=params, chunksize=50_000
+            )
+            data = pd.concat(chunks, ignore_index=True)
         
         # Convert timestamp to datetime
         if 'timestamp' in data.columns:
             data['timestamp'] = pd.to_datetime(data['timestamp'])
         
-        # Calculate profit/loss based on type and current price using robust data handling
+        # Calculate profit/loss based on type and current price on whole columns
+        # (missing or invalid values count as 0, non-finite results fall back to 0)
         if 'type' in data.columns and 'price' in data.columns and 'coinPrice' in data.columns:
-            data['profit'] = 0.0
-            for idx, row in data.iterrows():
-                # Convert values safely
-                price = safe_numeric_conversion(row['price'])
-                coin_price = safe_numeric_conversion(row['coinPrice'])
-                amount = safe_numeric_conversion(row['amount'])
-                
-                if row['type'] == 'buy':
-                    # For buy transactions, profit = (current_price - buy_price) * amount
-                    profit = safe_calculation(lambda cp, p, a: (cp - p) * a, coin_price, price, amount)
-                    data.at[idx, 'profit'] = profit
-                elif row['type'] == 'sell':
-                    # For sell transactions, profit = (sell_price - current_price) * amount
-                    profit = safe_calculation(lambda p, cp, a: (p - cp) * a, price, coin_price, amount)
-                    data.at[idx, 'profit'] = profit
+            price = pd.to_numeric(data['price'], errors='coerce').fillna(0.0).to_numpy(dtype='float64')
+            coin_price = pd.to_numeric(data['coinPrice'], errors='coerce').fillna(0.0).to_numpy(dtype='float64')
+            amount = pd.to_numeric(data['amount'], errors='coerce').fillna(0.0).to_numpy(dtype='float64')
+            
+            # For buy transactions, profit = (current_price - buy_price) * amount
+            # For sell transactions, profit = (sell_price - current_price) * amount
+            # Work in place on a single result array to avoid extra temporaries
+            profit = np.subtract(coin_price, price)
+            np.multiply(profit, amount, out=profit)
+            transaction_type = data['type'].to_numpy()
+            is_buy = transaction_type == 'buy'
+            is_sell = transaction_type == 'sell'
+            np.negative(profit, out=profit, where=is_sell)
+            profit[~(is_buy | is_sell) | ~np.isfinite(profit)] = 0.0
+            data['profit'] = profit
+        
+        # Store repeated string codes as categories; the joined frame repeats every
+        # token and wallet address once per transaction
+        data = data.astype({col: 'category' for col in BTS_CATEGORY_COLUMNS if col in data.columns})
         
         return data
         
@@ -169,89 +213,351 @@ def load_bts_transaction_data():
         st.error(f"Error loading BTS transaction data: {str(e)}")
         return pd.DataFrame()
 
-def generate_month_options():
+@lru_cache(maxsize=64)
+def _month_bounds(selected_month):
     """
-    Generate month options for filtering arbitrage data.
+    Return the first day of the selected month (YYYY-MM) and of the following month.
     """
-    data = load_arb_transaction_data()
-    if data.empty:
-        return ['All Data'], ['All']
+    # Parse selected month (format: YYYY-MM); Period arithmetic handles the year rollover
+    period = pd.Period(selected_month, freq='M')
+    return period.start_time, (period + 1).start_time
+
+def month_sql_condition(column, selected_month, inline=False):
+    """
+    Return a SQL condition restricting column to the selected month, with its bind parameters.
+    
+    With inline=True the bounds are written into the condition as ISO literals and no
+    parameters are returned, for drivers without bind parameters (ConnectorX). The
+    literals come from _month_bounds, never from raw user input.
+    """
+    if selected_month == 'All':
+        return 'TRUE', {}
     
-    # Get unique months from the data
-    data['year_month'] = data['dateTraded'].dt.strftime('%Y-%m')
-    unique_months = sorted(data['year_month'].unique(), reverse=True)
+    start_date, next_month = _month_bounds(selected_month)
+    if inline:
+        return f"{column} >= '{start_date.isoformat()}' AND {column} < '{next_month.isoformat()}'", {}
+    return (
+        f'{column} >= :start AND {column} < :end',
+        {'start': start_date.to_pydatetime(), 'end': next_month.to_pydatetime()}
+    )
+
+@st.cache_data(ttl=APP_CONFIG["cache_ttl"], max_entries=APP_CONFIG["cache_max_entries"], show_spinner=False)
+def load_arb_hourly_data(selected_month='All'):
+    """
+    Load arbitrage profit summed per hour, aggregated by Postgres so only one row
+    per hour crosses the wire.
+    """
+    try:
+        month_condition, params = month_sql_condition('"dateTraded"', selected_month)
+        query = f"""
+        SELECT
+            date_trunc('hour', "dateTraded") AS "dateTraded",
+            SUM({ARB_IDEAL_PROFIT_SQL}) AS "idealProfit"
+        FROM arbtransaction
+        WHERE "dateTraded" IS NOT NULL AND {month_condition}
+        GROUP BY 1
+        ORDER BY 1
+        """
+        
+        return pd.read_sql(text(query), get_engine(), params=params, parse_dates=['dateTraded'])
+        
+    except Exception as e:
+        st.error(f"Error loading hourly arbitrage data: {str(e)}")
+        return pd.DataFrame(columns=['dateTraded', 'idealProfit'])
+
+@st.cache_data(ttl=APP_CONFIG["bts_cache_ttl"], max_entries=APP_CONFIG["cache_max_entries"], show_spinner=False)
+def load_bts_hourly_data(selected_month='All'):
+    """
+    Load BTS profit, amount and dollar amount summed per hour, aggregated by Postgres.
+
+    Profit follows load_bts_transaction_data: (coinPrice - price) * amount for buys,
+    (price - coinPrice) * amount for sells, 0 otherwise, with missing values as 0.
+    The joins match the transaction loader so each hour sums the same rows.
+    """
+    try:
+        month_condition, params = month_sql_condition('bt.timestamp', selected_month)
+        query = f"""
+        SELECT
+            date_trunc('hour', bt.timestamp) AS timestamp,
+            COALESCE(SUM(
+                CASE bt.type
+                    WHEN 'buy' THEN (COALESCE(bci."coinPrice"::double precision, 0) - COALESCE(bt.price::double precision, 0))
+                                    * COALESCE(bt.amount::double precision, 0)
+                    WHEN 'sell' THEN (COALESCE(bt.price::double precision, 0) - COALESCE(bci."coinPrice"::double precision, 0))
+                                     * COALESCE(bt.amount::double precision, 0)
+                    ELSE 0
+                END
+            ), 0) AS profit,
+            COALESCE(SUM(bt.amount::double precision), 0) AS amount,
+            COALESCE(SUM(bt."amountInDollars"::double precision), 0) AS "amountInDollars"
+        FROM btstransaction bt
+        LEFT JOIN btscoininfo bci ON bt."tokenAddress" = bci."tokenAddress"
+        LEFT JOIN btsbundle bb ON bt."tokenAddress" = bb."tokenAddress"
+        WHERE bt.timestamp IS NOT NULL AND {month_condition}
+        GROUP BY 1
+        ORDER BY 1
+        """
+        
+        return pd.read_sql(text(query), get_engine(), params=params, parse_dates=['timestamp'])
+        
+    except Exception as e:
+        st.error(f"Error loading hourly BTS data: {str(e)}")
+        return pd.DataFrame(columns=['timestamp', 'profit', 'amount', 'amountInDollars'])
+
+@st.cache_data(ttl=APP_CONFIG["cache_ttl"])
+def load_months(table, column):
+    """
+    Return the distinct months (YYYY-MM) of a date column, newest first,
+    without loading the table.
+    """
+    engine = get_engine()
+    query = f"""
+    SELECT DISTINCT to_char(date_trunc('month', "{column}"), 'YYYY-MM') AS year_month
+    FROM {table}
+    WHERE "{column}" IS NOT NULL
+    ORDER BY year_month DESC
+    """
+    return pd.read_sql(query, engine)['year_month'].tolist()
+
+def build_month_options(table, column):
+    """
+    Build the month filter's display options and internal values for a table.
+    """
+    try:
+        unique_months = load_months(table, column)
+    except Exception as e:
+        st.error(f"Error loading months: {str(e)}")
+        return ['All Data'], ['All']
     
     # Create display options
-    month_options = ['All Data'] + [f"{datetime.strptime(month, '%Y-%m').strftime('%B %Y')}" for month in unique_months]
+    month_labels = pd.PeriodIndex(unique_months, freq='M').strftime('%B %Y').tolist()
+    month_options = ['All Data'] + month_labels
     month_values = ['All'] + unique_months
     
     return month_options, month_values
 
+def generate_month_options():
+    """
+    Generate month options for filtering arbitrage data.
+    """
+    return build_month_options('arbtransaction', 'dateTraded')
+
 def generate_bts_month_options():
     """
     Generate month options for filtering BTS transaction data.
     """
-    data = load_bts_transaction_data()
-    if data.empty:
-        return ['All Data'], ['All']
+    return build_month_options('btstransaction', 'timestamp')
+
+def build_arb_profit_figure(hourly_data, filtered_hourly_data):
+    """
+    Build the hourly profit scatter, falling back to the unfiltered points when
+    outlier removal leaves nothing to plot.
+    """
+    if not filtered_hourly_data.empty:
+        fig_profit = px.scatter(
+            filtered_hourly_data, 
+            x='dateTraded', 
+            y='idealProfit',
+            title='Hourly Profit Over Time (Outliers Removed)',
+            labels={'idealProfit': 'Profit (%)', 'dateTraded': 'Time'},
+            size='idealProfit',  # Size points based on profit
+            color='idealProfit',  # Color points based on profit
+            color_continuous_scale='RdYlGn'  # Red to green color scale
+        )
+    else:
+        fig_profit = px.scatter(
+            hourly_data, 
+            x='dateTraded', 
+            y='idealProfit',
+            title='Hourly Profit Over Time',
+            labels={'idealProfit': 'Profit (%)', 'dateTraded': 'Time'},
+            size='idealProfit',
+            color='idealProfit',
+            color_continuous_scale='RdYlGn'
+        )
+    fig_profit.update_layout(
+        xaxis_title="Time",
+        yaxis_title="Profit (%)",
+        height=400
+    )
+    return fig_profit
+
+def build_arb_dropdown_options(data):
+    """
+    Build the searchable trade dropdown labels, one per row in row order.
+    """
+    profit_values = data['idealProfit']
+    profit_display = profit_values.map('{:.2f}%'.format).where(profit_values.notna(), 'N/A')
+    if 'sellBase' in data.columns:
+        # Go through the string dtype first: fillna on a category needs 'Unknown' as a category
+        sell_base = data['sellBase'].astype('string').fillna('Unknown')
+    else:
+        sell_base = 'Unknown'
     
-    # Get unique months from the data
-    data['year_month'] = data['timestamp'].dt.strftime('%Y-%m')
-    unique_months = sorted(data['year_month'].unique(), reverse=True)
+    return (
+        "Trade #" + data['id'].astype(str)
+        + " - " + data['dateTraded'].dt.strftime('%Y-%m-%d %H:%M')
+        + " - Profit: " + profit_display
+        + " - " + sell_base
+    ).tolist()
+
+def build_bts_dropdown_options(data):
+    """
+    Build the searchable transaction dropdown labels, one per row in row order.
+    """
+    profit_values = data['profit']
+    profit_display = profit_values.map('${:.2f}'.format).where(profit_values.notna(), 'N/A')
     
-    # Create display options
-    month_options = ['All Data'] + [f"{datetime.strptime(month, '%Y-%m').strftime('%B %Y')}" for month in unique_months]
-    month_values = ['All'] + unique_months
+    # Get token address (shortened)
+    token_address = data['tokenAddress']
+    token_display = (token_address.astype(str).str.slice(0, 8) + "...").where(token_address.notna(), 'Unknown')
     
-    return month_options, month_values
+    return (
+        "Transaction #" + data['id'].astype(str)
+        + " - " + data['timestamp'].dt.strftime('%Y-%m-%d %H:%M')
+        + " - " + data['type'].astype(str).str.upper()
+        + " - Profit: " + profit_display
+        + " - " + token_display
+    ).tolist()
 
-def apply_month_filter(data, selected_month):
+def build_bts_profit_figure(hourly_data, filtered_hourly_data):
     """
-    Apply month filter to arbitrage data for charts.
+    Build the hourly profit scatter, falling back to the unfiltered points when
+    outlier removal leaves nothing to plot.
     """
-    if selected_month == 'All':
-        return data
+    if not filtered_hourly_data.empty:
+        # Create absolute profit for sizing (since Plotly doesn't accept negative sizes)
+        fig_profit = px.scatter(
+            filtered_hourly_data.assign(abs_profit=filtered_hourly_data['profit'].abs()), 
+            x='timestamp', 
+            y='profit',
+            title='Hourly Profit Over Time (Outliers Removed)',
+            labels={'profit': 'Profit ($)', 'timestamp': 'Time'},
+            size='abs_profit',  # Size points based on absolute profit
+            color='profit',  # Color points based on profit
+            color_continuous_scale='RdYlGn'  # Red to green color scale
+        )
+    else:
+        fig_profit = px.scatter(
+            hourly_data.assign(abs_profit=hourly_data['profit'].abs()), 
+            x='timestamp', 
+            y='profit',
+            title='Hourly Profit Over Time',
+            labels={'profit': 'Profit ($)', 'timestamp': 'Time'},
+            size='abs_profit',
+            color='profit',
+            color_continuous_scale='RdYlGn'
+        )
+    fig_profit.update_layout(
+        xaxis_title="Time",
+        yaxis_title="Profit ($)",
+        height=400
+    )
+    return fig_profit
+
+@st.cache_resource(ttl=APP_CONFIG["cache_ttl"], max_entries=APP_CONFIG["cache_max_entries"], show_spinner=False)
+def build_arb_view(selected_month):
+    """
+    Build the month's hourly chart data and figure.
     
-    # Parse selected month (format: YYYY-MM)
-    year, month = selected_month.split('-')
-    start_date = pd.to_datetime(f"{year}-{month}-01")
+    Cached as a shared resource so reruns triggered by other widgets (e.g. the trade
+    dropdown) reuse the Plotly figure instead of pickling or rebuilding it; callers
+    must treat the result as read-only.
     
-    # Get the last day of the month
-    if month == '12':
-        next_month = pd.to_datetime(f"{int(year)+1}-01-01")
-    else:
-        next_month = pd.to_datetime(f"{year}-{int(month)+1:02d}-01")
-    end_date = next_month - pd.Timedelta(days=1)
+    Returns:
+        dict: 'hourly' as (hourly_data, filtered_hourly_data), or None without data,
+        and the matching 'profit_fig'.
+    """
+    # Hourly profit is aggregated by Postgres; only the outliers are removed here
+    hourly_data = load_arb_hourly_data(selected_month)
+    if hourly_data.empty:
+        return {'hourly': None, 'profit_fig': None}
     
-    # Filter by month
-    return data[
-        (data['dateTraded'] >= start_date) & 
-        (data['dateTraded'] <= end_date)
-    ].copy()
+    filtered_hourly_data = handle_outliers_iqr(hourly_data, 'idealProfit', factor=1.5)
+    return {
+        'hourly': (hourly_data, filtered_hourly_data),
+        'profit_fig': build_arb_profit_figure(hourly_data, filtered_hourly_data)
+    }
 
-def apply_bts_month_filter(data, selected_month):
+@st.cache_resource(ttl=APP_CONFIG["cache_ttl"], max_entries=APP_CONFIG["cache_max_entries"], show_spinner=False)
+def build_arb_trade_options(selected_month, top_n):
     """
-    Apply month filter to BTS transaction data for charts.
+    Return the month's top_n most recent trades, newest first, and their dropdown labels.
     """
-    if selected_month == 'All':
-        return data
+    # Data is sorted by dateTraded, so the most recent trades are the tail
+    recent_trades = load_arb_transaction_data(selected_month).tail(top_n).iloc[::-1]
+    return recent_trades, build_arb_dropdown_options(recent_trades)
+
+@st.cache_resource(ttl=APP_CONFIG["bts_cache_ttl"], max_entries=APP_CONFIG["cache_max_entries"], show_spinner=False)
+def build_bts_view(selected_month):
+    """
+    Build the month's hourly chart data and figure.
     
-    # Parse selected month (format: YYYY-MM)
-    year, month = selected_month.split('-')
-    start_date = pd.to_datetime(f"{year}-{month}-01")
+    Cached as a shared resource like build_arb_view; callers must treat the result
+    as read-only.
+    """
+    # Hourly profit is aggregated by Postgres; only the outliers are removed here
+    hourly_data = load_bts_hourly_data(selected_month)
+    if hourly_data.empty:
+        return {'hourly': None, 'profit_fig': None}
     
-    # Get the last day of the month
-    if month == '12':
-        next_month = pd.to_datetime(f"{int(year)+1}-01-01")
-    else:
-        next_month = pd.to_datetime(f"{year}-{int(month)+1:02d}-01")
-    end_date = next_month - pd.Timedelta(days=1)
+    filtered_hourly_data = handle_outliers_iqr(hourly_data, 'profit', factor=1.5)
+    return {
+        'hourly': (hourly_data, filtered_hourly_data),
+        'profit_fig': build_bts_profit_figure(hourly_data, filtered_hourly_data)
+    }
+
+@st.cache_resource(ttl=APP_CONFIG["bts_cache_ttl"], max_entries=APP_CONFIG["cache_max_entries"], show_spinner=False)
+def build_bts_trade_options(selected_month, top_n):
+    """
+    Return the month's top_n most recent transactions and their dropdown labels.
+    """
+    # The loader returns transactions newest first
+    recent_transactions = load_bts_transaction_data(selected_month).head(top_n)
+    return recent_transactions, build_bts_dropdown_options(recent_transactions)
+
+def select_table_page(data):
+    """
+    Render the page picker for a transaction table and return the visible rows.
+    """
+    total_rows = len(data)
+    page_count = max(1, -(-total_rows // TABLE_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+    page_start = (page - 1) * TABLE_PAGE_SIZE
+    page_end = min(page_start + TABLE_PAGE_SIZE, total_rows)
+    
+    st.caption(f"Showing rows {page_start + 1 if total_rows else 0:,}-{page_end:,} of {total_rows:,}")
+    return data.iloc[page_start:page_end]
+
+def build_arb_display_table(data):
+    """
+    Build the formatted arbitrage transaction table.
+    
+    Formatting is applied through a Styler, so values stay numeric and sort correctly.
+    """
+    # Display data without original_idealProfit column
+    display_columns = [col for col in data.columns if col != 'original_idealProfit']
+    
+    # Format idealProfit column to show percentages with 2 decimal places
+    return data[display_columns].style.format({'idealProfit': '{:.2f}%'}, subset=['idealProfit'], na_rep='0.00%')
+
+def build_bts_display_table(data):
+    """
+    Build the formatted BTS transaction table.
     
-    # Filter by month
-    return data[
-        (data['timestamp'] >= start_date) & 
-        (data['timestamp'] <= end_date)
-    ].copy()
+    Formatting is applied through a Styler, so values stay numeric and sort correctly.
+    """
+    # Format dollar columns using robust utilities
+    dollar_columns = [col for col in ['profit', 'amountInDollars'] if col in data.columns]
+    return data.style.format(format_crypto_value, subset=dollar_columns)
+
+@st.cache_data(ttl=APP_CONFIG["cache_ttl"], max_entries=APP_CONFIG["cache_max_entries"], show_spinner=False)
+def build_arb_month_csv(selected_month):
+    """
+    Export the month's arbitrage transactions as CSV bytes for the download button.
+    """
+    data = load_arb_transaction_data(selected_month)
+    return data.drop(columns=['original_idealProfit'], errors='ignore').to_csv(index=False).encode('utf-8')
 
 # Main Bot Dashboard
 st.title("🤖 Bot Dashboard")
@@ -264,101 +570,45 @@ bot_type = st.selectbox(
 )
 
 if bot_type == "Arbitrage Bot":
-    # Load arbitrage data
-    data = load_arb_transaction_data()
+    # Arbitrage Bot Dashboard Logic (existing code)
+    st.subheader("Arbitrage Bot Dashboard")
+    
+    # Month filter
+    month_options, month_values = generate_month_options()
+    selected_month_display = st.selectbox("Filter by Month:", month_options, index=0)
+    
+    # Map display name to internal value
+    if selected_month_display == 'All Data':
+        selected_month = 'All'
+    else:
+        try:
+            index = month_options.index(selected_month_display)
+            selected_month = month_values[index]
+        except (ValueError, IndexError):
+            selected_month = 'All'
+    
+    # Load arbitrage data for the selected month only
+    data = load_arb_transaction_data(selected_month)
     
     if data.empty:
         st.warning("No arbitrage data available. Please check your database connection.")
     else:
-        # Arbitrage Bot Dashboard Logic (existing code)
-        st.subheader("Arbitrage Bot Dashboard")
+        # The month filter is applied in SQL (the frame is only read below, so no copy is needed)
+        filtered_data_for_display = data
         
-        # Month filter
-        month_options, month_values = generate_month_options()
-        selected_month_display = st.selectbox("Filter by Month:", month_options, index=0)
-        
-        # Map display name to internal value
-        if selected_month_display == 'All Data':
-            selected_month = 'All'
-        else:
-            try:
-                index = month_options.index(selected_month_display)
-                selected_month = month_values[index]
-            except (ValueError, IndexError):
-                selected_month = 'All'
-        
-        # Apply month filter to all data
-        if selected_month == 'All':
-            filtered_data_for_display = data.copy()
-        else:
-            # Parse selected month (format: YYYY-MM)
-            year, month = selected_month.split('-')
-            start_date = pd.to_datetime(f"{year}-{month}-01")
-            
-            # Get the last day of the month
-            if month == '12':
-                next_month = pd.to_datetime(f"{int(year)+1}-01-01")
-            else:
-                next_month = pd.to_datetime(f"{year}-{int(month)+1:02d}-01")
-            end_date = next_month - pd.Timedelta(days=1)
-            
-            # Filter by month
-            filtered_data_for_display = data[
-                (data['dateTraded'] >= start_date) & 
-                (data['dateTraded'] <= end_date)
-            ].copy()
-        
-        # Apply filter for charts (hourly aggregation)
-        filtered_data_for_charts = apply_month_filter(data, selected_month)
+        # Chart data and figure only depend on the month, so they come from the cache
+        arb_view = build_arb_view(selected_month)
         
         # Display chart
         st.subheader("📊 Trading Analytics")
         
         # Profit over time chart (Scatter)
-        if not filtered_data_for_charts.empty:
-            # Group by hour for better visualization
-            hourly_data = filtered_data_for_charts.groupby(
-                filtered_data_for_charts['dateTraded'].dt.floor('h')
-            ).agg({
-                'idealProfit': 'sum',
-                'buyVolume': 'sum',
-                'sellVolume': 'sum'
-            }).reset_index()
-            
-            # Remove outliers to spread data better
-            # Calculate Q1, Q3 and IQR for outlier detection
-            Q1 = hourly_data['idealProfit'].quantile(0.25)
-            Q3 = hourly_data['idealProfit'].quantile(0.75)
-            IQR = Q3 - Q1
-            
-            # Define outlier bounds (more conservative)
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            # Filter out extreme outliers for better visualization
-            filtered_hourly_data = hourly_data[
-                (hourly_data['idealProfit'] >= lower_bound) & 
-                (hourly_data['idealProfit'] <= upper_bound)
-            ].copy()
+        if arb_view['hourly'] is not None:
+            hourly_data, filtered_hourly_data = arb_view['hourly']
             
             # If we have data after filtering
             if not filtered_hourly_data.empty:
-                fig_profit = px.scatter(
-                    filtered_hourly_data, 
-                    x='dateTraded', 
-                    y='idealProfit',
-                    title='Hourly Profit Over Time (Outliers Removed)',
-                    labels={'idealProfit': 'Profit (%)', 'dateTraded': 'Time'},
-                    size='idealProfit',  # Size points based on profit
-                    color='idealProfit',  # Color points based on profit
-                    color_continuous_scale='RdYlGn'  # Red to green color scale
-                )
-                fig_profit.update_layout(
-                    xaxis_title="Time",
-                    yaxis_title="Profit (%)",
-                    height=400
-                )
-                st.plotly_chart(fig_profit, use_container_width=True)
+                st.plotly_chart(arb_view['profit_fig'], use_container_width=True)
                 
                 # Show outlier information
                 outlier_count = len(hourly_data) - len(filtered_hourly_data)
@@ -366,22 +616,7 @@ if bot_type == "Arbitrage Bot":
                     st.info(f"📊 {outlier_count} outlier data points removed for better visualization. Showing {len(filtered_hourly_data)} of {len(hourly_data)} total points.")
             else:
                 st.warning("No data points remain after outlier removal. Showing original data.")
-                fig_profit = px.scatter(
-                    hourly_data, 
-                    x='dateTraded', 
-                    y='idealProfit',
-                    title='Hourly Profit Over Time',
-                    labels={'idealProfit': 'Profit (%)', 'dateTraded': 'Time'},
-                    size='idealProfit',
-                    color='idealProfit',
-                    color_continuous_scale='RdYlGn'
-                )
-                fig_profit.update_layout(
-                    xaxis_title="Time",
-                    yaxis_title="Profit (%)",
-                    height=400
-                )
-                st.plotly_chart(fig_profit, use_container_width=True)
+                st.plotly_chart(arb_view['profit_fig'], use_container_width=True)
         
         # Summary statistics
         st.subheader("📈 Summary Statistics")
@@ -394,35 +629,18 @@ if bot_type == "Arbitrage Bot":
                 st.metric("Total Trades", f"{total_trades:,}")
             
             with col2:
-                # Ensure idealProfit is numeric for calculations
-                profit_series = filtered_data_for_display['idealProfit'].apply(lambda x: safe_numeric_conversion(x))
-                profitable_trades = len(profit_series[profit_series > 0])
+                # idealProfit is float64 straight from the loader
+                profit_series = filtered_data_for_display['idealProfit']
+                profitable_trades = int((profit_series > 0).sum())
                 win_rate = (profitable_trades / total_trades * 100) if total_trades > 0 else 0
                 st.metric("Win Rate", f"{win_rate:.1f}%")
         
         # Trade selection dropdown
         st.subheader("🔍 Select Trade for Detailed Analysis")
         
-        # Create formatted display data for searchable dropdown
-        display_data = []
-        for i, (idx, row) in enumerate(filtered_data_for_display.iterrows()):
-            # Handle potential mixed data types in idealProfit
-            profit_value = row['idealProfit']
-            if pd.notna(profit_value) and profit_value is not None:
-                try:
-                    profit_display = f"{float(profit_value):.2f}%"
-                except (ValueError, TypeError):
-                    profit_display = "N/A"
-            else:
-                profit_display = "N/A"
-            
-            display_data.append({
-                'position': i,  # Use position instead of original index
-                'display': f"Trade #{row['id']} - {row['dateTraded'].strftime('%Y-%m-%d %H:%M')} - Profit: {profit_display} - {row.get('sellBase', 'Unknown')}"
-            })
-        
-        # Create dropdown options
-        dropdown_options = [item['display'] for item in display_data]
+        # Only offer the most recent trades so the options sent to the browser stay bounded
+        top_n = st.slider("Show last N trades", DROPDOWN_MIN_TRADES, DROPDOWN_MAX_TRADES, DROPDOWN_DEFAULT_TRADES)
+        recent_trades, dropdown_options = build_arb_trade_options(selected_month, top_n)
         
         if dropdown_options:
             # Use selectbox with search functionality
@@ -433,9 +651,9 @@ if bot_type == "Arbitrage Bot":
                 help="Type to search through trades by ID, date, profit, or token name"
             )
             
-            # Find the selected trade data
-            selected_index = dropdown_options.index(selected_trade_display)
-            selected_trade_data = filtered_data_for_display.iloc[display_data[selected_index]['position']]
+            # Find the selected trade data by its position in the recent trades
+            selected_position = dropdown_options.index(selected_trade_display)
+            selected_trade_data = recent_trades.iloc[selected_position]
             
             # Store only the trade ID in session state for navigation
             st.session_state.selected_trade_id = selected_trade_data['id']
@@ -448,108 +666,61 @@ if bot_type == "Arbitrage Bot":
                 # Navigate to Arb Info page
                 st.switch_page("pages/2_Arb_Info.py")
         
-        # Transaction table (no pagination)
+        # Transaction table, paginated so only the visible page is formatted and sent to the browser
         st.subheader("📋 Transaction Table")
         
-        # Display data without original_idealProfit column
-        display_columns = [col for col in filtered_data_for_display.columns if col != 'original_idealProfit']
-        
-        # Create a copy of the data for display formatting
-        display_data = filtered_data_for_display[display_columns].copy()
+        display_data = build_arb_display_table(select_table_page(filtered_data_for_display))
+        st.dataframe(display_data, width='stretch')
         
-        # Format idealProfit column to show percentages with 2 decimal places using robust utilities
-        if 'idealProfit' in display_data.columns:
-            display_data['idealProfit'] = display_data['idealProfit'].apply(
-                lambda x: format_percentage(safe_numeric_conversion(x), decimals=2)
+        # The full export is only built when asked for, then cached per month for the cache period
+        csv_requested_key = f"arb_csv_requested_{selected_month}"
+        if st.session_state.get(csv_requested_key) or st.button("Prepare full CSV"):
+            st.session_state[csv_requested_key] = True
+            st.download_button(
+                "Download full CSV",
+                data=build_arb_month_csv(selected_month),
+                file_name=f"arb_transactions_{selected_month}.csv",
+                mime="text/csv"
             )
-        
-        st.dataframe(display_data, width='stretch')
 
 elif bot_type == "Sniper Bot":
-    # Load BTS transaction data
-    bts_data = load_bts_transaction_data()
+    st.subheader("Sniper Bot Dashboard")
+    
+    # Month filter for BTS data
+    month_options, month_values = generate_bts_month_options()
+    selected_month_display = st.selectbox("Filter by Month:", month_options, index=0)
+    
+    # Map display name to internal value
+    if selected_month_display == 'All Data':
+        selected_month = 'All'
+    else:
+        try:
+            index = month_options.index(selected_month_display)
+            selected_month = month_values[index]
+        except (ValueError, IndexError):
+            selected_month = 'All'
+    
+    # Load BTS transaction data for the selected month only
+    bts_data = load_bts_transaction_data(selected_month)
     
     if bts_data.empty:
         st.warning("No sniper bot data available. Please check your database connection.")
     else:
-        st.subheader("Sniper Bot Dashboard")
-        
-        # Month filter for BTS data
-        month_options, month_values = generate_bts_month_options()
-        selected_month_display = st.selectbox("Filter by Month:", month_options, index=0)
-        
-        # Map display name to internal value
-        if selected_month_display == 'All Data':
-            selected_month = 'All'
-        else:
-            try:
-                index = month_options.index(selected_month_display)
-                selected_month = month_values[index]
-            except (ValueError, IndexError):
-                selected_month = 'All'
-        
-        # Apply month filter to all data
-        if selected_month == 'All':
-            filtered_data_for_display = bts_data.copy()
-        else:
-            # Parse selected month (format: YYYY-MM)
-            year, month = selected_month.split('-')
-            start_date = pd.to_datetime(f"{year}-{month}-01")
-            
-            # Get the last day of the month
-            if month == '12':
-                next_month = pd.to_datetime(f"{int(year)+1}-01-01")
-            else:
-                next_month = pd.to_datetime(f"{year}-{int(month)+1:02d}-01")
-            end_date = next_month - pd.Timedelta(days=1)
-            
-            # Filter by month
-            filtered_data_for_display = bts_data[
-                (bts_data['timestamp'] >= start_date) & 
-                (bts_data['timestamp'] <= end_date)
-            ].copy()
-        
-        # Apply filter for charts (hourly aggregation)
-        filtered_data_for_charts = apply_bts_month_filter(bts_data, selected_month)
+        # The month filter is applied in SQL (st.cache_data already hands back a private copy)
+        filtered_data_for_display = bts_data
         
         # Display chart
         st.subheader("📊 Sniper Bot Analytics")
         
-        # Profit over time chart (Scatter)
-        if not filtered_data_for_charts.empty:
-            # Group by hour for better visualization
-            hourly_data = filtered_data_for_charts.groupby(
-                filtered_data_for_charts['timestamp'].dt.floor('h')
-            ).agg({
-                'profit': 'sum',
-                'amount': 'sum',
-                'amountInDollars': 'sum'
-            }).reset_index()
-            
-            # Remove outliers using robust data handling
-            filtered_hourly_data = handle_outliers_iqr(hourly_data, 'profit', factor=1.5)
+        # Profit over time chart (Scatter), grouped by hour in Postgres for better visualization;
+        # chart data and figure only depend on the month, so they come from the cache
+        bts_view = build_bts_view(selected_month)
+        if bts_view['hourly'] is not None:
+            hourly_data, filtered_hourly_data = bts_view['hourly']
             
             # If we have data after filtering
             if not filtered_hourly_data.empty:
-                # Create absolute profit for sizing (since Plotly doesn't accept negative sizes)
-                filtered_hourly_data['abs_profit'] = filtered_hourly_data['profit'].abs()
-                
-                fig_profit = px.scatter(
-                    filtered_hourly_data, 
-                    x='timestamp', 
-                    y='profit',
-                    title='Hourly Profit Over Time (Outliers Removed)',
-                    labels={'profit': 'Profit ($)', 'timestamp': 'Time'},
-                    size='abs_profit',  # Size points based on absolute profit
-                    color='profit',  # Color points based on profit
-                    color_continuous_scale='RdYlGn'  # Red to green color scale
-                )
-                fig_profit.update_layout(
-                    xaxis_title="Time",
-                    yaxis_title="Profit ($)",
-                    height=400
-                )
-                st.plotly_chart(fig_profit, use_container_width=True)
+                st.plotly_chart(bts_view['profit_fig'], use_container_width=True)
                 
                 # Show outlier information
                 outlier_count = len(hourly_data) - len(filtered_hourly_data)
@@ -557,25 +728,7 @@ elif bot_type == "Sniper Bot":
                     st.info(f"📊 {outlier_count} outlier data points removed for better visualization. Showing {len(filtered_hourly_data)} of {len(hourly_data)} total points.")
             else:
                 st.warning("No data points remain after outlier removal. Showing original data.")
-                # Create absolute profit for sizing (since Plotly doesn't accept negative sizes)
-                hourly_data['abs_profit'] = hourly_data['profit'].abs()
-                
-                fig_profit = px.scatter(
-                    hourly_data, 
-                    x='timestamp', 
-                    y='profit',
-                    title='Hourly Profit Over Time',
-                    labels={'profit': 'Profit ($)', 'timestamp': 'Time'},
-                    size='abs_profit',
-                    color='profit',
-                    color_continuous_scale='RdYlGn'
-                )
-                fig_profit.update_layout(
-                    xaxis_title="Time",
-                    yaxis_title="Profit ($)",
-                    height=400
-                )
-                st.plotly_chart(fig_profit, use_container_width=True)
+                st.plotly_chart(bts_view['profit_fig'], use_container_width=True)
         
         # Summary statistics
         st.subheader("📈 Summary Statistics")
@@ -588,9 +741,9 @@ elif bot_type == "Sniper Bot":
                 st.metric("Total Trades", f"{total_trades:,}")
             
             with col2:
-                # Calculate profitable trades
-                profit_series = filtered_data_for_display['profit'].apply(lambda x: safe_numeric_conversion(x))
-                profitable_trades = len(profit_series[profit_series > 0])
+                # Calculate profitable trades (profit is float64 straight from the loader)
+                profit_series = filtered_data_for_display['profit']
+                profitable_trades = int((profit_series > 0).sum())
                 win_rate = (profitable_trades / total_trades * 100) if total_trades > 0 else 0
                 st.metric("Win Rate", f"{win_rate:.1f}%")
             
@@ -602,29 +755,9 @@ elif bot_type == "Sniper Bot":
         # Transaction selection dropdown
         st.subheader("🔍 Select Transaction for Detailed Analysis")
         
-        # Create formatted display data for searchable dropdown
-        display_data = []
-        for i, (idx, row) in enumerate(filtered_data_for_display.iterrows()):
-            # Handle potential mixed data types in profit
-            profit_value = row['profit']
-            if pd.notna(profit_value) and profit_value is not None:
-                try:
-                    profit_display = f"${float(profit_value):.2f}"
-                except (ValueError, TypeError):
-                    profit_display = "N/A"
-            else:
-                profit_display = "N/A"
-            
-            # Get token address (shortened)
-            token_addr = str(row['tokenAddress'])[:8] + "..." if pd.notna(row['tokenAddress']) else "Unknown"
-            
-            display_data.append({
-                'position': i,  # Use position instead of original index
-                'display': f"Transaction #{row['id']} - {row['timestamp'].strftime('%Y-%m-%d %H:%M')} - {row['type'].upper()} - Profit: {profit_display} - {token_addr}"
-            })
-        
-        # Create dropdown options
-        dropdown_options = [item['display'] for item in display_data]
+        # Only offer the most recent transactions so the options sent to the browser stay bounded
+        top_n = st.slider("Show last N transactions", DROPDOWN_MIN_TRADES, DROPDOWN_MAX_TRADES, DROPDOWN_DEFAULT_TRADES)
+        recent_transactions, dropdown_options = build_bts_trade_options(selected_month, top_n)
         
         if dropdown_options:
             # Use selectbox with search functionality
@@ -635,9 +768,9 @@ elif bot_type == "Sniper Bot":
                 help="Type to search through transactions by ID, date, type, profit, or token address"
             )
             
-            # Find the selected trade data
-            selected_index = dropdown_options.index(selected_trade_display)
-            selected_trade_data = filtered_data_for_display.iloc[display_data[selected_index]['position']]
+            # Find the selected trade data by its position in the recent transactions
+            selected_position = dropdown_options.index(selected_trade_display)
+            selected_trade_data = recent_transactions.iloc[selected_position]
             
             # Store only the transaction ID in session state for navigation
             st.session_state.selected_bts_transaction_id = selected_trade_data['id']
@@ -650,24 +783,10 @@ elif bot_type == "Sniper Bot":
                 # Navigate to BTS Info page
                 st.switch_page("pages/3_BTS_Info.py")
         
-        # Transaction table (no pagination)
+        # Transaction table, paginated so only the visible page is formatted and sent to the browser
         st.subheader("📋 Transaction Table")
         
-        # Create a copy of the data for display formatting
-        display_data = filtered_data_for_display.copy()
-        
-        # Format profit column to show dollar amounts using robust utilities
-        if 'profit' in display_data.columns:
-            display_data['profit'] = display_data['profit'].apply(
-                lambda x: format_crypto_value(safe_numeric_conversion(x))
-            )
-        
-        # Format amountInDollars column using robust utilities
-        if 'amountInDollars' in display_data.columns:
-            display_data['amountInDollars'] = display_data['amountInDollars'].apply(
-                lambda x: format_crypto_value(safe_numeric_conversion(x))
-            )
-        
+        display_data = build_bts_display_table(select_table_page(filtered_data_for_display))
         st.dataframe(display_data, width='stretch')
 
 elif bot_type == "Failed Sniper Bot":
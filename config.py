@@ -1,13 +1,19 @@
-import streamlit as st
+from functools import cache
+
+# Streamlit is only imported when a secret-backed setting is first read, so
+# scripts that just need APP_CONFIG/CHART_CONFIG don't pay for it
 
 # Database configuration from secrets.toml
-DB_CONFIG = {
-    "host": st.secrets.DB_CONFIG.host,
-    "port": st.secrets.DB_CONFIG.port,
-    "database": st.secrets.DB_CONFIG.database,
-    "user": st.secrets.DB_CONFIG.user,
-    "password": st.secrets.DB_CONFIG.password
-}
+@cache
+def db_config():
+    import streamlit as st
+    return {
+        "host": st.secrets.DB_CONFIG.host,
+        "port": st.secrets.DB_CONFIG.port,
+        "database": st.secrets.DB_CONFIG.database,
+        "user": st.secrets.DB_CONFIG.user,
+        "password": st.secrets.DB_CONFIG.password
+    }
 
 # Application settings
 APP_CONFIG = {
@@ -15,7 +21,9 @@ APP_CONFIG = {
     "page_icon": "🎯",
     "layout": "wide",
     "initial_sidebar_state": "expanded",
-    "cache_ttl": 300  # 5 minutes
+    "cache_ttl": 300,  # 5 minutes
+    "bts_cache_ttl": 900,  # 15 minutes; sniper data changes less often
+    "cache_max_entries": 4  # cached months per loader
 }
 
 # Chart settings
@@ -35,9 +43,23 @@ CHART_CONFIG = {
 }
 
 # Google AI (Gemini) configuration
-GEMINI_CONFIG = {
-    "api_key": st.secrets.GEMINI_CONFIG.api_key,  # Get from secrets.toml or environment variable
-    "model": "gemini-1.5-flash",  # Free tier model
-    "max_tokens": 500,  # Optimized for free tier
-    "temperature": 0.7
+@cache
+def gemini_config():
+    import streamlit as st
+    return {
+        "api_key": st.secrets.GEMINI_CONFIG.api_key,  # Get from secrets.toml or environment variable
+        "model": "gemini-1.5-flash",  # Free tier model
+        "max_tokens": 500,  # Optimized for free tier
+        "temperature": 0.7
+    }
+
+# Keep `from config import DB_CONFIG, GEMINI_CONFIG` working (PEP 562)
+_LAZY_CONFIGS = {
+    "DB_CONFIG": db_config,
+    "GEMINI_CONFIG": gemini_config
 }
+
+def __getattr__(name):
+    if name in _LAZY_CONFIGS:
+        return _LAZY_CONFIGS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
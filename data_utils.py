@@ -5,12 +5,31 @@ Handles cryptocurrency data with high precision decimals and mixed data types
 
 import pandas as pd
 import numpy as np
+from bisect import bisect_right
+from collections import Counter
 from decimal import Decimal, getcontext
+import logging
 import warnings
 
 # Set high precision for decimal calculations
 getcontext().prec = 50
 
+_log = logging.getLogger(__name__)
+
+# Failure counts for the hot numeric helpers (cheaper than a warning per failure)
+_FAILS = Counter()
+
+# Formatting characters stripped from numeric strings, and strings treated as missing
+_CLEAN_TRANS = str.maketrans('', '', ',$%')
+_NULL_SET = frozenset({'', 'nan', 'none', 'null'})
+
+# format_crypto_value magnitude bands: |v| < 1e-8, < 0.01, < 1, < 1000, and above
+_THRESH = (1e-8, 1e-2, 1.0, 1e3)
+_DECIMALS = (18, 8, 6, 4, 2)
+
+# Thousands-separated fixed-point format specs, indexed by decimal count
+_CRYPTO_SPECS = tuple(f",.{decimals}f" for decimals in range(max(_DECIMALS) + 1))
+
 def safe_numeric_conversion(value, default=0.0, precision=18):
     """
     Safely convert values to numeric, handling strings, decimals, and mixed types.
@@ -23,14 +42,20 @@ def safe_numeric_conversion(value, default=0.0, precision=18):
     Returns:
         float: Converted numeric value
     """
-    if pd.isna(value) or value is None:
+    # Fast path for plain Python numbers and None (NaN is the only float != itself)
+    value_type = type(value)
+    if value_type is float:
+        return value if value == value else default
+    if value_type is int:
+        return float(value)
+    if value is None:
         return default
     
     # Handle string values
     if isinstance(value, str):
-        # Remove common formatting characters
-        cleaned = value.replace(',', '').replace('$', '').replace('%', '').strip()
-        if cleaned == '' or cleaned.lower() in ['nan', 'none', 'null']:
+        # Remove common formatting characters in a single pass
+        cleaned = value.translate(_CLEAN_TRANS).strip()
+        if cleaned.lower() in _NULL_SET:
             return default
         
         try:
@@ -43,16 +68,11 @@ def safe_numeric_conversion(value, default=0.0, precision=18):
             except:
                 return default
     
-    # Handle pandas numeric types
-    if pd.api.types.is_numeric_dtype(type(value)):
-        return float(value)
-    
-    # Handle numpy types
-    if isinstance(value, (np.integer, np.floating)):
-        return float(value)
+    if pd.isna(value):
+        return default
     
-    # Handle Decimal types
-    if isinstance(value, Decimal):
+    # Handle Python subclasses, numpy scalars and Decimal types
+    if isinstance(value, (int, float, np.integer, np.floating, Decimal)):
         return float(value)
     
     # Try pandas conversion as last resort
@@ -64,6 +84,64 @@ def safe_numeric_conversion(value, default=0.0, precision=18):
     except:
         return default
 
+def _sanitize(values, default):
+    """
+    Replace NaN in a float array with a default, as one masked ufunc pass.
+    
+    Args:
+        values: float64 ndarray (left untouched)
+        default: Value written over NaN entries
+    
+    Returns:
+        np.ndarray: New float64 array
+    """
+    out = np.array(values, dtype='float64')
+    np.copyto(out, default, where=np.isnan(out))
+    return out
+
+def safe_numeric_series(series, default=0.0):
+    """
+    Vectorized safe_numeric_conversion for a whole Series.
+    
+    Args:
+        series: Input Series (numeric, string, Decimal or mixed object values)
+        default: Value used wherever conversion fails
+    
+    Returns:
+        pd.Series: float64 Series with the same index
+    """
+    # Numeric columns only need missing values filled
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype='float64', na_value=np.nan)
+        return pd.Series(_sanitize(values, default), index=series.index, name=series.name)
+    
+    # Everything else goes through its string form: strip common formatting characters
+    # and let pd.to_numeric turn anything unparseable ('', 'nan', 'None', ...) into NaN
+    cleaned = series.astype(str).str.replace(r'[,$%]', '', regex=True).str.strip()
+    return pd.to_numeric(cleaned, errors='coerce').astype('float64').fillna(default)
+
+def _as_float_array(series, default=0.0):
+    """
+    Read-only float64 view of a Series, coercing only when the dtype requires it.
+    
+    Args:
+        series: Input Series
+        default: Value used wherever conversion fails
+    
+    Returns:
+        np.ndarray: float64 array (may share memory with the Series, do not mutate)
+    """
+    if isinstance(series.dtype, np.dtype):
+        # float64 columns without NaN are returned as-is, zero-copy
+        if series.dtype == np.float64:
+            values = series.to_numpy(copy=False)
+            return _sanitize(values, default) if np.isnan(values).any() else values
+        # Integer and boolean columns can't hold NaN, only the cast is needed
+        if series.dtype.kind in 'iub':
+            return series.to_numpy(dtype='float64')
+    
+    return safe_numeric_series(series, default).to_numpy()
+
 def safe_decimal_conversion(value, precision=18):
     """
     Convert to Decimal for high precision calculations.
@@ -75,8 +153,31 @@ def safe_decimal_conversion(value, precision=18):
     Returns:
         Decimal: High precision decimal value
     """
+    if isinstance(value, Decimal):
+        return Decimal(0) if value.is_nan() else value
+    
+    # Parse strings directly so no digits are lost to a float round-trip
+    if isinstance(value, str):
+        cleaned = value.translate(_CLEAN_TRANS).strip()
+        if cleaned.lower() in _NULL_SET:
+            return Decimal(0)
+        try:
+            parsed = Decimal(cleaned)
+        except ArithmeticError:
+            return Decimal(0)
+        return Decimal(0) if parsed.is_nan() else parsed
+    
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return Decimal(int(value))
+    
     numeric_val = safe_numeric_conversion(value, default=0.0, precision=precision)
-    return Decimal(str(numeric_val))
+    
+    # Below 17 significant digits a fixed-precision format is exact enough and rounds
+    # in one C-level call; at 17+ it would print binary-artifact digits
+    # (0.1 -> 0.100000000000000006), so fall back to the shortest repr
+    if precision < 17:
+        return Decimal(format(numeric_val, f'.{precision}g'))
+    return Decimal(repr(numeric_val))
 
 def format_crypto_value(value, currency_symbol="$", max_decimals=18, min_decimals=2):
     """
@@ -97,21 +198,13 @@ def format_crypto_value(value, currency_symbol="$", max_decimals=18, min_decimal
         return f"{currency_symbol}0.00"
     
     # Determine appropriate decimal places based on value magnitude
-    if abs(numeric_val) < 0.00000001:  # Very small values
-        decimals = min(max_decimals, 18)
-    elif abs(numeric_val) < 0.01:  # Small values
-        decimals = min(max_decimals, 8)
-    elif abs(numeric_val) < 1:  # Medium values
-        decimals = min(max_decimals, 6)
-    elif abs(numeric_val) < 1000:  # Large values
-        decimals = min(max_decimals, 4)
-    else:  # Very large values
-        decimals = min(max_decimals, 2)
+    decimals = min(max_decimals, _DECIMALS[bisect_right(_THRESH, abs(numeric_val))])
     
     # Ensure we don't go below minimum decimals
     decimals = max(decimals, min_decimals)
     
-    return f"{currency_symbol}{numeric_val:,.{decimals}f}"
+    spec = _CRYPTO_SPECS[decimals] if decimals < len(_CRYPTO_SPECS) else f",.{decimals}f"
+    return currency_symbol + format(numeric_val, spec)
 
 def format_percentage(value, decimals=2):
     """
@@ -152,7 +245,9 @@ def safe_calculation(operation, *values, default=0.0):
         
         return float(result)
     except Exception as e:
-        warnings.warn(f"Calculation failed: {e}, using default value {default}")
+        _FAILS['safe_calculation'] += 1
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(f"Calculation failed: {e}, using default value {default}")
         return default
 
 def validate_dataframe_columns(df, required_columns, numeric_columns=None):
@@ -171,15 +266,16 @@ def validate_dataframe_columns(df, required_columns, numeric_columns=None):
         return df
     
     # Check required columns
-    missing_cols = [col for col in required_columns if col not in df.columns]
+    missing_cols = set(required_columns).difference(df.columns)
     if missing_cols:
-        warnings.warn(f"Missing required columns: {missing_cols}")
+        warnings.warn(f"Missing required columns: {sorted(missing_cols)}")
     
-    # Convert numeric columns
+    # Convert numeric columns into a new frame in one assign (the input is left untouched)
     if numeric_columns:
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: safe_numeric_conversion(x))
+        df = df.assign(**{
+            col: safe_numeric_series(df[col])
+            for col in numeric_columns if col in df.columns
+        })
     
     return df
 
@@ -200,17 +296,39 @@ def safe_aggregation(df, group_col, agg_dict):
         if group_col not in df.columns:
             raise ValueError(f"Group column '{group_col}' not found")
         
-        # Clean numeric columns before aggregation
-        numeric_cols = list(agg_dict.keys())
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: safe_numeric_conversion(x))
+        # Clean numeric columns in one vectorized pass before aggregation
+        df = df.assign(**{
+            col: safe_numeric_series(df[col])
+            for col in agg_dict if col in df.columns
+        })
         
-        return df.groupby(group_col).agg(agg_dict).reset_index()
+        # Skip sorting the groups and expanding unobserved categories
+        return df.groupby(group_col, sort=False, observed=True).agg(agg_dict).reset_index()
     except Exception as e:
         warnings.warn(f"Aggregation failed: {e}")
         return pd.DataFrame()
 
+def _iqr_mask(values, factor):
+    """
+    Return a boolean mask of the values inside the IQR fences.
+    
+    Args:
+        values: float64 ndarray
+        factor: IQR factor for outlier detection
+    
+    Returns:
+        np.ndarray: True where the value is not an outlier
+    """
+    # Calculate Q1 and Q3 with one partition-based quantile call
+    Q1, Q3 = np.quantile(values, [0.25, 0.75])
+    IQR = Q3 - Q1
+    
+    # Define bounds
+    lower_bound = Q1 - factor * IQR
+    upper_bound = Q3 + factor * IQR
+    
+    return (values >= lower_bound) & (values <= upper_bound)
+
 def handle_outliers_iqr(data, column, factor=1.5):
     """
     Handle outliers using IQR method with safe numeric conversion.
@@ -226,22 +344,20 @@ def handle_outliers_iqr(data, column, factor=1.5):
     if column not in data.columns or data.empty:
         return data
     
-    # Convert to numeric safely
-    numeric_data = data[column].apply(lambda x: safe_numeric_conversion(x))
-    
-    # Calculate IQR
-    Q1 = numeric_data.quantile(0.25)
-    Q3 = numeric_data.quantile(0.75)
-    IQR = Q3 - Q1
-    
-    # Define bounds
-    lower_bound = Q1 - factor * IQR
-    upper_bound = Q3 + factor * IQR
-    
-    # Filter outliers
-    mask = (numeric_data >= lower_bound) & (numeric_data <= upper_bound)
+    # Convert to numeric safely (zero-copy when the column is already float64)
+    numeric_data = _as_float_array(data[column])
     
-    return data[mask].copy()
+    # Filter outliers (boolean indexing already returns a new frame)
+    return data[_iqr_mask(numeric_data, factor)]
+
+# create_safe_metrics reducers that can skip the Series wrapper
+_FAST = {
+    np.sum: np.ndarray.sum,
+    np.mean: np.ndarray.mean,
+    np.min: np.ndarray.min,
+    np.max: np.ndarray.max,
+    len: len,
+}
 
 def create_safe_metrics(data, metric_configs):
     """
@@ -263,21 +379,33 @@ def create_safe_metrics(data, metric_configs):
         
         try:
             if column in data.columns:
-                # Convert to numeric safely
-                numeric_data = data[column].apply(lambda x: safe_numeric_conversion(x))
-                
-                # Apply function
-                result = func(numeric_data)
+                # Apply function (common reducers run straight on the float64 array)
+                fast_func = _FAST.get(func)
+                if fast_func is not None and len(data):
+                    result = fast_func(_as_float_array(data[column]))
+                else:
+                    result = func(safe_numeric_series(data[column]))
                 
                 # Validate result
-                if pd.isna(result) or np.isinf(result):
+                if not np.isfinite(result):
                     metrics[name] = 0
                 else:
                     metrics[name] = float(result)
             else:
                 metrics[name] = 0
         except Exception as e:
-            warnings.warn(f"Metric calculation failed for {name}: {e}")
+            _FAILS['create_safe_metrics'] += 1
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug(f"Metric calculation failed for {name}: {e}")
             metrics[name] = 0
     
     return metrics
+
+def get_failure_counts():
+    """
+    Get how often the numeric helpers fell back to their default value.
+    
+    Returns:
+        dict: Failure count per helper name
+    """
+    return dict(_FAILS)
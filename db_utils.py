@@ -0,0 +1,31 @@
+"""
+Database Utilities for MemeDD Dashboard
+Shares one SQLAlchemy engine and connection pool across the app and its pages
+"""
+
+import streamlit as st
+from sqlalchemy import create_engine
+from config import DB_CONFIG
+
+# Connection string shared by the SQLAlchemy engine and ConnectorX
+DATABASE_URL = (
+    f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@"
+    f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
+)
+
+@st.cache_resource
+def get_engine():
+    """
+    Create the SQLAlchemy engine once per process and share its connection pool.
+    
+    Returns:
+        Engine: Pooled engine; connections are pinged before use and recycled
+        after 30 minutes so idle sockets never go stale.
+    """
+    return create_engine(
+        DATABASE_URL,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800
+    )
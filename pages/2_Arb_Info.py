@@ -3,27 +3,90 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
 import os
-from google import genai
-from config import DB_CONFIG, CHART_CONFIG, GEMINI_CONFIG
+from collections import OrderedDict
+import re
+from config import CHART_CONFIG, GEMINI_CONFIG
+from db_utils import get_engine
 from data_utils import (
     safe_numeric_conversion, 
     safe_decimal_conversion, 
     format_crypto_value, 
     format_percentage,
     safe_calculation,
-    validate_dataframe_columns
+    validate_dataframe_columns,
+    safe_numeric_series
 )
 
-# Set the environment variable for Google AI API key
-os.environ["GEMINI_API_KEY"] = GEMINI_CONFIG["api_key"]
+# Numeric trade fields in the Complete Trade Data card
+CRYPTO_VALUE_COLUMNS = ['idealProfit', 'buyVolume', 'sellVolume', 'buyTotal', 'sellTotal', 'buyVwap', 'sellVwap']
 
-# Initialize Gemini client (API key is automatically picked up from environment)
-client = genai.Client()
+# Complete Trade Data display formats (applied by the frontend, not per cell in Python).
+# Profit and VWAPs use significant digits so sub-cent profits and tiny meme-coin prices stay visible.
+TRADE_COLUMN_CONFIG = {
+    'idealProfit': st.column_config.NumberColumn(format="$%.6g"),
+    'buyTotal': st.column_config.NumberColumn(format="$%.2f"),
+    'sellTotal': st.column_config.NumberColumn(format="$%.2f"),
+    'buyVolume': st.column_config.NumberColumn(format="%.2f"),
+    'sellVolume': st.column_config.NumberColumn(format="%.2f"),
+    'buyVwap': st.column_config.NumberColumn(format="$%.6g"),
+    'sellVwap': st.column_config.NumberColumn(format="$%.6g"),
+    'dateTraded': st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss"),
+}
+
+# Fields the Profit Calculation Breakdown card needs
+REQUIRED_PROFIT_COLUMNS = frozenset({'buyVolume', 'buyVwap', 'sellVolume', 'sellVwap'})
+
+# Column name keywords for the Coin/Token Information card (a column can match both)
+TOKEN_KEYWORDS_RE = re.compile(r'token|coin|symbol|pair|market', re.IGNORECASE)
+MARKET_KEYWORDS_RE = re.compile(r'price|market|cap|volume|liquidity', re.IGNORECASE)
+
+# Columns already shown in the Trade Details and Exchange Information sections
+DETAIL_COLUMNS = frozenset({
+    'dateTraded', 'id', 'idealProfit', 'buyVolume', 'buyVwap', 'sellVolume', 'sellVwap',
+    'buyExchange', 'sellExchange'
+})
+
+def partition_trade_columns(trade_data):
+    """
+    Split trade columns into token, market and other (non-null, not yet displayed) lists
+    in a single pass over the index.
+    """
+    token_cols, market_cols, other_cols = [], [], []
+    for col, value in trade_data.items():
+        is_token = TOKEN_KEYWORDS_RE.search(col) is not None
+        is_market = MARKET_KEYWORDS_RE.search(col) is not None
+        if is_token:
+            token_cols.append(col)
+        if is_market:
+            market_cols.append(col)
+        if not (is_token or is_market) and col not in DETAIL_COLUMNS and pd.notna(value):
+            other_cols.append(col)
+    return token_cols, market_cols, other_cols
+
+@st.cache_resource
+def get_gemini_client():
+    """
+    Create the Gemini client once per server process.
+    google.genai is imported here so page loads that never reach the chat don't pay for it.
+    """
+    from google import genai
+    
+    # Set the environment variable for Google AI API key (picked up by the client)
+    os.environ["GEMINI_API_KEY"] = GEMINI_CONFIG["api_key"]
+    return genai.Client()
+
+# Most recent chat messages sent to Gemini with each question (three exchanges plus the new question)
+CHAT_HISTORY_TURNS = 7
+
+# Most recent chat messages rendered before the "show earlier" toggle
+CHAT_VISIBLE_MESSAGES = 20
+
+# Trades whose chat history is kept in the session (least recently viewed is dropped)
+CHAT_HISTORY_LIMIT = 16
 
 # Custom CSS for cards that actually works in Streamlit
-st.markdown("""
+CARD_CSS = """
 <style>
 /* Target containers directly for card styling */
 div[data-testid="stVerticalBlock"] > div:has(> div[data-testid="stVerticalBlock"]) {
@@ -39,7 +102,10 @@ div[data-testid="stVerticalBlock"] > div:has(> div[data-testid="stVerticalBlock"
     margin-top: 20px !important;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Emitted on every run: Streamlit drops elements a rerun does not re-emit
+st.markdown(CARD_CSS, unsafe_allow_html=True)
 
 @st.cache_data
 def load_specific_trade_data(trade_id):
@@ -47,11 +113,8 @@ def load_specific_trade_data(trade_id):
     Load specific trade data from PostgreSQL database by trade ID.
     """
     try:
-        # Create database connection
-        engine = create_engine(
-            f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@"
-            f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-        )
+        # Reuse the pooled database engine
+        engine = get_engine()
         
         # Load specific trade data using parameterized query to prevent SQL injection
         query = "SELECT * FROM arbtransaction WHERE id = %s"
@@ -107,6 +170,140 @@ def load_specific_trade_data(trade_id):
         st.error(f"Error loading trade data: {str(e)}")
         return None
 
+@st.cache_data(show_spinner=False)
+def build_trade_context(trade_id, trade_dict):
+    """
+    Build the LLM context string for a trade (cached per trade).
+    """
+    # Structured summary plus the non-null coin/token fields instead of the whole row
+    token_cols, _, _ = partition_trade_columns(trade_dict)
+    coin_info = pd.Series(trade_dict, dtype=object).reindex(token_cols).dropna().to_dict()
+    return f"""TRADE SUMMARY: ( Date/Time: {trade_dict['dateTraded']} Trade ID: {trade_id} Buy Exchange: {trade_dict['buyExchange']} Sell Exchange: {trade_dict['sellExchange']} Buy Volume: {trade_dict['buyVolume']} Buy VWAP: {trade_dict['buyVwap']} Sell Volume: {trade_dict['sellVolume']} Sell VWAP: {trade_dict['sellVwap']} Profit: {trade_dict['idealProfit']}) COIN INFO: {coin_info}"""
+
+@st.fragment
+def render_trade_chat(selected_trade_data):
+    """
+    Render the AI Assistant chat for a trade.
+    Runs as a fragment so chat input only reruns this block, not the whole page.
+    """
+    # Chat history for this trade, kept in a per-session LRU of the most recent trades
+    chat_histories = st.session_state.setdefault('arb_chat_histories', OrderedDict())
+    chat_id = selected_trade_data.get('id', 'unknown')
+    messages = chat_histories.setdefault(chat_id, [])
+    chat_histories.move_to_end(chat_id)
+    while len(chat_histories) > CHAT_HISTORY_LIMIT:
+        chat_histories.popitem(last=False)
+    
+    # Display the most recent chat messages from history on rerun (earlier ones on request)
+    hidden_count = len(messages) - CHAT_VISIBLE_MESSAGES
+    show_all = hidden_count > 0 and st.toggle(f"Show {hidden_count} earlier messages", key=f"show_history_{chat_id}")
+    for message in (messages if show_all else messages[-CHAT_VISIBLE_MESSAGES:]):
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+    
+    # Accept user input
+    if prompt := st.chat_input("Ask about this trade or coin..."):
+        # Add user message to chat history
+        messages.append({"role": "user", "content": prompt})
+        
+        # Display user message in chat message container
+        with st.chat_message("user"):
+            st.markdown(prompt)
+        
+        # Display assistant response in chat message container
+        with st.chat_message("assistant"):
+            # Give AI the trade summary (built once per trade)
+            context = build_trade_context(selected_trade_data['id'], selected_trade_data.to_dict())
+            
+            # Instructions and trade data go in the system instruction, the recent turns as chat contents
+            # (error and empty replies are display-only and never sent back as model turns)
+            system_instruction = f"""You are a cryptocurrency trading analyst. Analyze this trade data and answer the user's question. {context} Provide a direct, helpful answer based on the data."""
+            history = [message for message in messages if message["content"] and not message.get("display_only")]
+            recent = history[-CHAT_HISTORY_TURNS:]
+            # Never open on a model reply whose question was cut off
+            while recent and recent[0]["role"] == "assistant":
+                recent = recent[1:]
+            contents = [
+                {"role": "model" if message["role"] == "assistant" else "user", "parts": [{"text": message["content"]}]}
+                for message in recent
+            ]
+            
+            # Stream the response using Gemini so tokens render as they arrive
+            try:
+                stream = get_gemini_client().models.generate_content_stream(
+                    model=GEMINI_CONFIG["model"],
+                    contents=contents,
+                    config={"system_instruction": system_instruction}
+                )
+                response_text = st.write_stream(chunk.text for chunk in stream if chunk.text)
+                if response_text:
+                    messages.append({"role": "assistant", "content": response_text})
+                else:
+                    empty_message = "Sorry, no response was generated for this question."
+                    st.warning(empty_message)
+                    messages.append({"role": "assistant", "content": empty_message, "display_only": True})
+            except Exception as e:
+                error_message = f"Sorry, I encountered an error while generating the response: {str(e)}"
+                st.error(error_message)
+                messages.append({"role": "assistant", "content": error_message, "display_only": True})
+    
+    # Add clear chat button
+    if st.button("🗑️ Clear Chat", key=f"clear_chat_{chat_id}"):
+        messages.clear()
+        st.rerun(scope="fragment")
+
+@st.cache_data(show_spinner=False)
+def prepare_trade_view(trade_id, _trade_data):
+    """
+    Build every trade-derived display value for the page (cached per trade ID,
+    so chat and button reruns skip the coercion and formatting).
+    """
+    # Coerce the numeric trade fields once and reuse them in every card
+    trade_nums = safe_numeric_series(
+        _trade_data.reindex(['buyVolume', 'buyVwap', 'sellVolume', 'sellVwap', 'idealProfit'])
+    )
+    buy_vol, buy_vwap, sell_vol, sell_vwap, profit_val = trade_nums.tolist()
+    
+    # Handle date formatting
+    date_traded = _trade_data.get('dateTraded')
+    try:
+        date_display = date_traded.strftime('%m-%d %H:%M:%S') if pd.notna(date_traded) else 'N/A'
+    except (AttributeError, TypeError):
+        date_display = 'N/A'
+    
+    # Look for market and other columns (token columns feed the chat context)
+    _, market_cols, other_cols = partition_trade_columns(_trade_data)
+    
+    # One-row frame with real dtypes; st.dataframe formats it client-side via TRADE_COLUMN_CONFIG
+    trade_df = pd.DataFrame([_trade_data]).infer_objects()
+    crypto_cols = trade_df.columns.intersection(CRYPTO_VALUE_COLUMNS)
+    trade_df = trade_df.assign(**{col: safe_numeric_series(trade_df[col]) for col in crypto_cols})
+    
+    return {
+        'date_display': date_display,
+        'buy_vol': buy_vol,
+        'sell_vol': sell_vol,
+        'buy_vwap_display': format_crypto_value(buy_vwap, max_decimals=18),
+        'sell_vwap_display': format_crypto_value(sell_vwap, max_decimals=18),
+        'buy_total_display': format_crypto_value(buy_vol * buy_vwap, max_decimals=18),
+        'sell_total_display': format_crypto_value(sell_vol * sell_vwap, max_decimals=18),
+        'profit_display': format_crypto_value(profit_val, max_decimals=18),
+        # First 3 market / other columns as (label, value) rows
+        'market_rows': [
+            (col.replace('_', ' ').title(), safe_numeric_conversion(_trade_data[col]))
+            for col in market_cols[:3] if pd.notna(_trade_data[col])
+        ],
+        'other_rows': [
+            (col.replace('_', ' ').title(), safe_numeric_conversion(_trade_data[col]))
+            for col in other_cols[:3]
+        ],
+        'trade_df': trade_df,
+    }
+
+def markdown_rows(rows):
+    """Render (label, value) pairs as one markdown bullet list (one element instead of one per field)"""
+    return "\n".join(f"- **{label}:** {value}" for label, value in rows)
+
 def show_arb_info():
     st.title("📊 Arb Info")
     
@@ -122,6 +319,9 @@ def show_arb_info():
         st.error("Trade not found or error loading trade data.")
         return
     
+    # Trade-derived values are computed once per trade, not on every rerun
+    view = prepare_trade_view(selected_trade_data['id'], selected_trade_data)
+    
     # Display trade details
     st.subheader("🔍 Detailed Analysis for Selected Trade")
     
@@ -135,124 +335,56 @@ def show_arb_info():
             colsub1, colsub2 = st.columns(2)
 
             with colsub1:
-                # Handle date formatting
-                try:
-                    date_display = selected_trade_data['dateTraded'].strftime('%m-%d %H:%M:%S') if pd.notna(selected_trade_data['dateTraded']) else 'N/A'
-                except (AttributeError, TypeError):
-                    date_display = 'N/A'
-                st.write(f"**Date/Time:** {date_display}")
-                st.write(f"**Trade ID:** {selected_trade_data['id']}")
-
-                # Handle profit formatting using robust data utilities
-                profit_val = safe_numeric_conversion(selected_trade_data['idealProfit'])
-                profit_display = format_crypto_value(profit_val)
-                st.write(f"**Profit:** {profit_display}")
+                st.markdown(markdown_rows([
+                    ("Date/Time", view['date_display']),
+                    ("Trade ID", selected_trade_data['id']),
+                    ("Profit", view['profit_display']),
+                ]))
 
             with colsub2:
-
-                # Handle buy volume formatting using robust data utilities
-                buy_vol = safe_numeric_conversion(selected_trade_data['buyVolume'])
-                buy_vol_display = f"{buy_vol:,.2f}"
-                st.write(f"**Buy Volume:** {buy_vol_display}")
-                
-                # Handle buy VWAP formatting using robust data utilities
-                buy_vwap = safe_numeric_conversion(selected_trade_data['buyVwap'])
-                buy_vwap_display = format_crypto_value(buy_vwap, max_decimals=18)
-                st.write(f"**Buy VWAP:** {buy_vwap_display}")
-
-                # Handle sell volume formatting using robust data utilities
-                sell_vol = safe_numeric_conversion(selected_trade_data['sellVolume'])
-                sell_vol_display = f"{sell_vol:,.2f}"
-                st.write(f"**Sell Volume:** {sell_vol_display}")
-
-                # Handle sell VWAP formatting using robust data utilities
-                sell_vwap = safe_numeric_conversion(selected_trade_data['sellVwap'])
-                sell_vwap_display = format_crypto_value(sell_vwap, max_decimals=18)
-                st.write(f"**Sell VWAP:** {sell_vwap_display}")
+                st.markdown(markdown_rows([
+                    ("Buy Volume", f"{view['buy_vol']:,.2f}"),
+                    ("Buy VWAP", view['buy_vwap_display']),
+                    ("Sell Volume", f"{view['sell_vol']:,.2f}"),
+                    ("Sell VWAP", view['sell_vwap_display']),
+                ]))
         
         with col2:
             # Transaction data
             st.markdown("#### 💰 Transaction Data")
-            # Handle buy total calculation using robust data utilities
-            buy_vol = safe_numeric_conversion(selected_trade_data['buyVolume'])
-            buy_vwap = safe_numeric_conversion(selected_trade_data['buyVwap'])
-            buy_total = safe_calculation(lambda bv, bvwap: bv * bvwap, buy_vol, buy_vwap)
-            buy_total_display = format_crypto_value(buy_total, max_decimals=18)
-            st.metric("Buy Total", buy_total_display)
-        
-            # Handle sell total calculation using robust data utilities
-            sell_vol = safe_numeric_conversion(selected_trade_data['sellVolume'])
-            sell_vwap = safe_numeric_conversion(selected_trade_data['sellVwap'])
-            sell_total = safe_calculation(lambda sv, svwap: sv * svwap, sell_vol, sell_vwap)
-            sell_total_display = format_crypto_value(sell_total, max_decimals=18)
-            st.metric("Sell Total", sell_total_display)
+            st.metric("Buy Total", view['buy_total_display'])
+            st.metric("Sell Total", view['sell_total_display'])
     
     # Card 2: Coin/Token Information
     st.markdown("### 🪙 Coin/Token Information")
     with st.container():
-        # Look for token/coin related columns
-        token_cols = [col for col in selected_trade_data.index if any(keyword in col.lower() for keyword in ['token', 'coin', 'symbol', 'pair', 'market'])]
-        
         col1, col2, col3 = st.columns(3)
         
         with col1:
              # Exchange information
             st.markdown("#### 🏪 Exchange Information")
-        
-            st.write(f"**Buy Exchange:** {selected_trade_data['buyExchange']}")
-
-            st.write(f"**Sell Exchange:** {selected_trade_data['sellExchange']}")
-        
-            st.write(f"**Exchange Route:** {selected_trade_data['buyExchange']} → {selected_trade_data['sellExchange']}")
+            st.markdown(markdown_rows([
+                ("Buy Exchange", selected_trade_data['buyExchange']),
+                ("Sell Exchange", selected_trade_data['sellExchange']),
+                ("Exchange Route", f"{selected_trade_data['buyExchange']} → {selected_trade_data['sellExchange']}"),
+            ]))
         
         with col2:
             st.markdown("#### 📊 Market Data")
-            # Look for market-related columns
-            market_cols = [col for col in selected_trade_data.index if any(keyword in col.lower() for keyword in ['price', 'market', 'cap', 'volume', 'liquidity'])]
-            
-            if market_cols:
-                for col in market_cols[:3]:  # Show first 3 market columns
-                    if pd.notna(selected_trade_data[col]):
-                        try:
-                            # Try to convert to numeric for formatting
-                            numeric_val = safe_numeric_conversion(selected_trade_data[col])
-                            if pd.notna(numeric_val):
-                                st.write(f"**{col.replace('_', ' ').title()}:** {numeric_val}")
-                            else:
-                                st.write(f"**{col.replace('_', ' ').title()}:** {selected_trade_data[col]}")
-                        except (ValueError, TypeError):
-                            st.write(f"**{col.replace('_', ' ').title()}:** {selected_trade_data[col]}")
+            # Market-related columns
+            if view['market_rows']:
+                st.markdown(markdown_rows(view['market_rows']))
             else:
                 st.write("**Market data not available**")
         
         with col3:
             st.markdown("#### 🔗 Additional Info")
             # Show other relevant columns that haven't been displayed yet
-            displayed_cols = ['dateTraded', 'id', 'idealProfit', 'buyVolume', 'buyVwap', 'sellVolume', 'sellVwap'] + ['buyExchange', 'sellExchange'] + token_cols + market_cols
-            other_cols = [col for col in selected_trade_data.index if col not in displayed_cols and pd.notna(selected_trade_data[col])]
-            
-            if other_cols:
-                for col in other_cols[:3]:  # Show first 3 other columns
-                    if pd.notna(selected_trade_data[col]):
-                        try:
-                            # Try to convert to numeric for formatting
-                            numeric_val = safe_numeric_conversion(selected_trade_data[col])
-                            if pd.notna(numeric_val):
-                                st.write(f"**{col.replace('_', ' ').title()}:** {numeric_val}")
-                            else:
-                                st.write(f"**{col.replace('_', ' ').title()}:** {selected_trade_data[col]}")
-                        except (ValueError, TypeError):
-                            st.write(f"**{col.replace('_', ' ').title()}:** {selected_trade_data[col]}")
+            if view['other_rows']:
+                st.markdown(markdown_rows(view['other_rows']))
             else:
                 st.write("**No additional data available**")
     
-    # Extract coin information for LLM chat
-    coin_info = {}
-    if token_cols:
-        for col in token_cols:
-            if pd.notna(selected_trade_data[col]):
-                coin_info[col] = selected_trade_data[col]
-    
     # Create 70-30 split layout for trade details and chat
     main_col, chat_col = st.columns([7, 3])
     
@@ -260,83 +392,18 @@ def show_arb_info():
         # Card 3: Profit Calculation Breakdown
         st.markdown("### 💰 Profit Calculation Breakdown")
         with st.container():
-            if all(col in selected_trade_data for col in ['buyVolume', 'buyVwap', 'sellVolume', 'sellVwap']):
-                # Handle buy total calculation using robust data utilities
-                buy_vol = safe_numeric_conversion(selected_trade_data['buyVolume'])
-                buy_vwap = safe_numeric_conversion(selected_trade_data['buyVwap'])
-                buy_total = safe_calculation(lambda bv, bvwap: bv * bvwap, buy_vol, buy_vwap)
-                buy_total_display = format_crypto_value(buy_total, max_decimals=18)
-                
-                # Handle sell total calculation using robust data utilities
-                sell_vol = safe_numeric_conversion(selected_trade_data['sellVolume'])
-                sell_vwap = safe_numeric_conversion(selected_trade_data['sellVwap'])
-                sell_total = safe_calculation(lambda sv, svwap: sv * svwap, sell_vol, sell_vwap)
-                sell_total_display = format_crypto_value(sell_total, max_decimals=18)
-                
-                # Handle profit calculation using robust data utilities
-                profit_val = safe_numeric_conversion(selected_trade_data['idealProfit'])
-                profit_display = format_crypto_value(profit_val, max_decimals=18)
-                
+            if REQUIRED_PROFIT_COLUMNS.issubset(selected_trade_data.index):
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("Buy Total", buy_total_display)
+                    st.metric("Buy Total", view['buy_total_display'])
                 with col2:
-                    st.metric("Sell Total", sell_total_display)
+                    st.metric("Sell Total", view['sell_total_display'])
                 with col3:
-                    st.metric("Profit", profit_display)
+                    st.metric("Profit", view['profit_display'])
         
-        # Card 4: Complete Trade Data
-        st.markdown("### 📋 Complete Trade Data")
-        formatted_trade = selected_trade_data.copy()
-        
-        # Format numeric columns based on requirements using robust data utilities
-        for col in formatted_trade.index:
-            # Get the scalar value from the Series - ensure it's a scalar
-            col_value = formatted_trade[col]
-            
-            # Convert pandas Series to scalar if needed
-            if hasattr(col_value, 'iloc') and hasattr(col_value, '__len__'):
-                try:
-                    col_value = col_value.iloc[0] if len(col_value) > 0 else None
-                except (IndexError, AttributeError):
-                    col_value = None
-            
-            if col in ['idealProfit', 'buyVolume', 'sellVolume', 'buyTotal', 'sellTotal']:
-                # Use robust data utilities for formatting
-                numeric_val = safe_numeric_conversion(col_value)
-                formatted_trade[col] = format_crypto_value(numeric_val, max_decimals=18)
-            elif col in ['buyVwap', 'sellVwap']:
-                # Use robust data utilities for VWAP formatting
-                numeric_val = safe_numeric_conversion(col_value)
-                formatted_trade[col] = format_crypto_value(numeric_val, max_decimals=18)
-            elif col == 'dateTraded':
-                # Format date/time
-                try:
-                    if pd.notna(formatted_trade[col]):
-                        formatted_trade[col] = formatted_trade[col].strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        formatted_trade[col] = "N/A"
-                except (AttributeError, TypeError):
-                    formatted_trade[col] = "N/A"
-            elif isinstance(formatted_trade[col], (int, float)):
-                # Handle other numeric fields
-                try:
-                    if pd.notna(formatted_trade[col]):
-                        formatted_trade[col] = f"{formatted_trade[col]:,.0f}"
-                    else:
-                        formatted_trade[col] = "N/A"
-                except (ValueError, TypeError):
-                    formatted_trade[col] = "N/A"
-            else:
-                # Handle string/object fields
-                if pd.notna(formatted_trade[col]):
-                    formatted_trade[col] = str(formatted_trade[col])
-                else:
-                    formatted_trade[col] = "N/A"
-        
-        # Convert Series to DataFrame for display
-        formatted_df = pd.DataFrame([formatted_trade])
-        st.dataframe(formatted_df, width='stretch')
+        # Card 4: Complete Trade Data (collapsed by default)
+        with st.expander("📋 Complete Trade Data", expanded=False):
+            st.dataframe(view['trade_df'], column_config=TRADE_COLUMN_CONFIG, width='stretch')
         
         # Add back button
         if st.button("← Back to Bot Dashboard"):
@@ -348,51 +415,7 @@ def show_arb_info():
         # Card 5: AI Assistant
         st.markdown("### 🤖 AI Assistant")
         with st.container():
-            # Initialize chat history with unique key for this trade
-            chat_key = f"messages_{selected_trade_data.get('id', 'unknown')}"
-            if chat_key not in st.session_state:
-                st.session_state[chat_key] = []
-            
-            # Display chat messages from history on app rerun
-            for message in st.session_state[chat_key]:
-                with st.chat_message(message["role"]):
-                    st.markdown(message["content"])
-            
-            # Accept user input
-            if prompt := st.chat_input("Ask about this trade or coin..."):
-                # Add user message to chat history
-                st.session_state[chat_key].append({"role": "user", "content": prompt})
-                
-                # Display user message in chat message container
-                with st.chat_message("user"):
-                    st.markdown(prompt)
-                
-                # Display assistant response in chat message container
-                with st.chat_message("assistant"):
-                    # Give AI all the raw data
-                    context = f"""COMPLETE TRADE DATA (RAW): {selected_trade_data.to_dict()} TRADE SUMMARY: ( Date/Time: {selected_trade_data['dateTraded']} Trade ID: {selected_trade_data['id']} Buy Exchange: {selected_trade_data['buyExchange']} Sell Exchange: {selected_trade_data['sellExchange']} Buy Volume: {selected_trade_data['buyVolume']} Buy VWAP: {selected_trade_data['buyVwap']} Sell Volume: {selected_trade_data['sellVolume']} Sell VWAP: {selected_trade_data['sellVwap']} Profit: {selected_trade_data['idealProfit']})"""
-                    
-                    # Create prompt for Gemini
-                    full_prompt = f"""You are a cryptocurrency trading analyst. Analyze this trade data and answer the user's question. {context} USER QUESTION: {prompt} Provide a direct, helpful answer based on the data."""
-                    
-                    # Generate response using Gemini (following official docs)
-                    try:
-                        response = client.models.generate_content(
-                            model=GEMINI_CONFIG["model"],
-                            contents=full_prompt
-                        )
-                        response_text = response.text
-                        st.markdown(response_text)
-                        st.session_state[chat_key].append({"role": "assistant", "content": response_text})
-                    except Exception as e:
-                        error_message = f"Sorry, I encountered an error while generating the response: {str(e)}"
-                        st.error(error_message)
-                        st.session_state[chat_key].append({"role": "assistant", "content": error_message})
-            
-            # Add clear chat button
-            if st.button("🗑️ Clear Chat", key=f"clear_chat_{selected_trade_data.get('id', 'unknown')}"):
-                st.session_state[chat_key] = []
-                st.rerun()
+            render_trade_chat(selected_trade_data)
 
 # Run the arb info page
 show_arb_info()
@@ -1,26 +1,34 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
 import os
-from google import genai
-from config import DB_CONFIG, CHART_CONFIG, GEMINI_CONFIG
+from collections import OrderedDict
+from config import CHART_CONFIG, GEMINI_CONFIG
+from db_utils import get_engine
 from data_utils import (
     safe_numeric_conversion, 
     safe_decimal_conversion, 
     format_crypto_value, 
     format_percentage,
     safe_calculation,
-    validate_dataframe_columns
+    validate_dataframe_columns,
+    safe_numeric_series
 )
 
-# Set the environment variable for Google AI API key
-os.environ["GEMINI_API_KEY"] = GEMINI_CONFIG["api_key"]
-
-# Initialize Gemini client (API key is automatically picked up from environment)
-client = genai.Client()
+@st.cache_resource
+def get_gemini_client():
+    """
+    Create the Gemini client once per server process.
+    google.genai is imported here so page loads that never reach the chat don't pay for it.
+    """
+    from google import genai
+    
+    # Set the environment variable for Google AI API key (picked up by the client)
+    os.environ["GEMINI_API_KEY"] = GEMINI_CONFIG["api_key"]
+    return genai.Client()
 
 # Custom CSS for cards that actually works in Streamlit
 st.markdown("""
@@ -41,17 +49,32 @@ div[data-testid="stVerticalBlock"] > div:has(> div[data-testid="stVerticalBlock"
 </style>
 """, unsafe_allow_html=True)
 
+# Numeric transaction fields shown in the detail cards
+NUMERIC_COLUMNS = [
+    'profit', 'amount', 'price', 'amountInDollars', 'coinPrice', 'devCapital', 'tokenSupply',
+    'devholderPercentage', 'totalHoldersSupply', 'liquidityToMcapRatio', 'reservesInSOL',
+    'confidence', 'totalBuyers', 'suspiciousBuyers'
+]
+
+# Fields needed for the loader's profit/loss and the Profit Calculation Breakdown card
+PROFIT_SOURCE_COLUMNS = frozenset({'type', 'price', 'coinPrice'})
+VALUE_SOURCE_COLUMNS = frozenset({'amount', 'price', 'coinPrice'})
+
+# Transactions whose chat history is kept in the session (least recently viewed is dropped)
+CHAT_HISTORY_LIMIT = 16
+
+# Complete Transaction Data columns formatted as dollar values / high-precision prices
+DOLLAR_VALUE_COLUMNS = frozenset({'profit', 'amountInDollars'})
+PRICE_COLUMNS = frozenset({'price', 'coinPrice'})
+
 @st.cache_data
 def load_specific_bts_transaction_data(transaction_id):
     """
     Load specific BTS transaction data from PostgreSQL database by transaction ID.
     """
     try:
-        # Create database connection
-        engine = create_engine(
-            f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@"
-            f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-        )
+        # Reuse the pooled database engine
+        engine = get_engine()
         
         # Load specific transaction data with joins using parameterized query
         query = """
@@ -109,7 +132,7 @@ def load_specific_bts_transaction_data(transaction_id):
             transaction_data['timestamp'] = pd.to_datetime(transaction_data['timestamp'])
         
         # Calculate profit/loss based on type and current price using robust data handling
-        if 'type' in transaction_data.index and 'price' in transaction_data.index and 'coinPrice' in transaction_data.index:
+        if PROFIT_SOURCE_COLUMNS.issubset(transaction_data.index):
             # Convert price columns to numeric safely
             price = safe_numeric_conversion(transaction_data['price'])
             coin_price = safe_numeric_conversion(transaction_data['coinPrice'])
@@ -132,6 +155,121 @@ def load_specific_bts_transaction_data(transaction_id):
         st.error(f"Error loading BTS transaction data: {str(e)}")
         return None
 
+def shorten_address(address):
+    """Shorten a wallet/token/dev address to its first and last 8 characters for display"""
+    if pd.isna(address):
+        return "N/A"
+    address = str(address)
+    return f"{address[:8]}...{address[-8:]}" if len(address) > 16 else address
+
+def is_valid_value(val):
+    """Safe null check: None, empty values and scalar NaN/NaT are not displayable"""
+    if val is None:
+        return False
+    if hasattr(val, '__len__') and len(val) == 0:
+        return False
+    return not (pd.api.types.is_scalar(val) and pd.isna(val))
+
+@st.cache_data(show_spinner=False)
+def format_transaction_row(transaction_id, _transaction_data):
+    """
+    Format a transaction row for the Complete Transaction Data table, one column group at a time
+    (cached per transaction ID, so reruns of the same view skip it).
+    """
+    transaction_data = _transaction_data
+    # Build the output directly (every cell starts as "N/A" and is written at most once)
+    formatted_transaction = pd.Series("N/A", index=transaction_data.index, dtype=object)
+    valid = transaction_data.map(is_valid_value).astype(bool)
+    
+    # Dollar values, high-precision prices and the timestamp have their own formats below
+    value_cols = transaction_data.index.isin(list(DOLLAR_VALUE_COLUMNS | PRICE_COLUMNS))
+    plain = valid & ~value_cols & (transaction_data.index != 'timestamp')
+    
+    # Handle other numeric fields with thousands separators, and string/object fields
+    is_number = plain & transaction_data.map(lambda v: isinstance(v, (int, float, np.integer, np.floating)))
+    formatted_transaction[is_number] = [f"{v:,.0f}" for v in transaction_data[is_number]]
+    formatted_transaction[plain & ~is_number] = transaction_data[plain & ~is_number].astype(str)
+    
+    # Use robust data utilities for dollar values and high-precision prices
+    formatted_transaction[value_cols] = safe_numeric_series(transaction_data[value_cols]).map(
+        lambda v: format_crypto_value(v, max_decimals=18)
+    )
+    
+    # Format date/time
+    if 'timestamp' in transaction_data.index:
+        timestamp = transaction_data['timestamp']
+        formatted_transaction['timestamp'] = (
+            timestamp.strftime('%Y-%m-%d %H:%M:%S') if valid['timestamp'] and hasattr(timestamp, 'strftime') else "N/A"
+        )
+    
+    return formatted_transaction
+
+@st.cache_data(show_spinner=False)
+def build_transaction_context(transaction_id, transaction_dict):
+    """
+    Build the LLM context string for a transaction (cached per transaction).
+    """
+    return f"""COMPLETE TRANSACTION DATA (RAW): {transaction_dict} TRANSACTION SUMMARY: ( Date/Time: {transaction_dict['timestamp']} Transaction ID: {transaction_id} Type: {transaction_dict['type']} Amount: {transaction_dict['amount']} Price: {transaction_dict['price']} Wallet Address: {transaction_dict['walletAddress']} Token Address: {transaction_dict['tokenAddress']} Profit: {transaction_dict['profit']} Current Coin Price: {transaction_dict['coinPrice']} Dev Capital: {transaction_dict['devCapital']} Bundle Confidence: {transaction_dict.get('confidence', 'N/A')})"""
+
+@st.fragment
+def render_transaction_chat(selected_transaction_data):
+    """
+    Render the AI Assistant chat for a BTS transaction.
+    Runs as a fragment so chat input only reruns this block, not the whole page.
+    """
+    # Chat history for this transaction, kept in a per-session LRU of the most recent transactions
+    chat_histories = st.session_state.setdefault('bts_chat_histories', OrderedDict())
+    chat_id = selected_transaction_data.get('id', 'unknown')
+    messages = chat_histories.setdefault(chat_id, [])
+    chat_histories.move_to_end(chat_id)
+    while len(chat_histories) > CHAT_HISTORY_LIMIT:
+        chat_histories.popitem(last=False)
+    
+    # Display chat messages from history on app rerun
+    for message in messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+    
+    # Accept user input
+    if prompt := st.chat_input("Ask about this transaction or token..."):
+        # Add user message to chat history
+        messages.append({"role": "user", "content": prompt})
+        
+        # Display user message in chat message container
+        with st.chat_message("user"):
+            st.markdown(prompt)
+        
+        # Display assistant response in chat message container
+        with st.chat_message("assistant"):
+            # Give AI all the raw data (serialized once per transaction)
+            context = build_transaction_context(selected_transaction_data['id'], selected_transaction_data.to_dict())
+            
+            # Create prompt for Gemini
+            full_prompt = f"""You are a cryptocurrency trading analyst specializing in sniper bot transactions and bundle detection. Analyze this transaction data and answer the user's question. {context} USER QUESTION: {prompt} Provide a direct, helpful answer based on the data."""
+            
+            # Stream the response using Gemini so tokens render as they arrive
+            try:
+                stream = get_gemini_client().models.generate_content_stream(
+                    model=GEMINI_CONFIG["model"],
+                    contents=full_prompt
+                )
+                response_text = st.write_stream(chunk.text for chunk in stream if chunk.text)
+                if response_text:
+                    messages.append({"role": "assistant", "content": response_text})
+                else:
+                    empty_message = "Sorry, no response was generated for this question."
+                    st.warning(empty_message)
+                    messages.append({"role": "assistant", "content": empty_message, "display_only": True})
+            except Exception as e:
+                error_message = f"Sorry, I encountered an error while generating the response: {str(e)}"
+                st.error(error_message)
+                messages.append({"role": "assistant", "content": error_message, "display_only": True})
+    
+    # Add clear chat button
+    if st.button("🗑️ Clear Chat", key=f"clear_chat_{chat_id}"):
+        messages.clear()
+        st.rerun(scope="fragment")
+
 def show_bts_info():
     st.title("🎯 BTS Info")
     
@@ -147,6 +285,15 @@ def show_bts_info():
         st.error("Transaction not found or error loading transaction data.")
         return
     
+    # Coerce the numeric transaction fields once and reuse them in every card
+    nums = safe_numeric_series(selected_transaction_data.reindex(NUMERIC_COLUMNS)).to_dict()
+    transaction_value_display = format_crypto_value(nums['amount'] * nums['price'], max_decimals=18)
+    current_value_display = format_crypto_value(nums['amount'] * nums['coinPrice'], max_decimals=18)
+    profit_display = format_crypto_value(nums['profit'], max_decimals=18)
+    
+    # Formatted row for the Complete Transaction Data card (cached per transaction)
+    formatted_transaction = format_transaction_row(selected_transaction_data['id'], selected_transaction_data)
+    
     # Display transaction details
     st.subheader("🔍 Detailed Analysis for Selected Transaction")
     
@@ -160,57 +307,26 @@ def show_bts_info():
             colsub1, colsub2 = st.columns(2)
 
             with colsub1:
-                # Handle timestamp formatting
-                try:
-                    timestamp_display = selected_transaction_data['timestamp'].strftime('%m-%d %H:%M:%S') if pd.notna(selected_transaction_data['timestamp']) else 'N/A'
-                except (AttributeError, TypeError):
-                    timestamp_display = 'N/A'
+                # Short timestamp: reuse the formatted 'YYYY-MM-DD HH:MM:SS' string without the year
+                timestamp_full = formatted_transaction.get('timestamp', 'N/A')
+                timestamp_display = timestamp_full[5:] if timestamp_full != 'N/A' else 'N/A'
                 st.write(f"**Date/Time:** {timestamp_display}")
                 st.write(f"**Transaction ID:** {selected_transaction_data['id']}")
                 st.write(f"**Type:** {selected_transaction_data['type'].upper()}")
 
-                # Handle profit formatting with robust data handling
-                profit_val = safe_numeric_conversion(selected_transaction_data['profit'])
-                profit_display = format_crypto_value(profit_val)
                 st.write(f"**Profit:** {profit_display}")
 
             with colsub2:
-                # Handle amount formatting with robust data handling
-                amount = safe_numeric_conversion(selected_transaction_data['amount'])
-                amount_display = f"{amount:,.2f}"
-                st.write(f"**Amount:** {amount_display}")
-                
-                # Handle price formatting with robust data handling
-                price = safe_numeric_conversion(selected_transaction_data['price'])
-                price_display = format_crypto_value(price, max_decimals=18)
-                st.write(f"**Price:** {price_display}")
-
-                # Handle amount in dollars formatting with robust data handling
-                amount_dollars = safe_numeric_conversion(selected_transaction_data['amountInDollars'])
-                amount_dollars_display = format_crypto_value(amount_dollars)
-                st.write(f"**Amount in Dollars:** {amount_dollars_display}")
+                st.write(f"**Amount:** {nums['amount']:,.2f}")
+                st.write(f"**Price:** {format_crypto_value(nums['price'], max_decimals=18)}")
+                st.write(f"**Amount in Dollars:** {format_crypto_value(nums['amountInDollars'])}")
         
         with col2:
             # Transaction data
             st.markdown("#### 💰 Transaction Data")
             
-            # Handle wallet address
-            wallet_addr = selected_transaction_data.get('walletAddress', 'N/A')
-            if pd.notna(wallet_addr):
-                # Shorten wallet address for display
-                wallet_display = f"{str(wallet_addr)[:8]}...{str(wallet_addr)[-8:]}" if len(str(wallet_addr)) > 16 else str(wallet_addr)
-            else:
-                wallet_display = "N/A"
-            st.write(f"**Wallet Address:** {wallet_display}")
-            
-            # Handle token address
-            token_addr = selected_transaction_data.get('tokenAddress', 'N/A')
-            if pd.notna(token_addr):
-                # Shorten token address for display
-                token_display = f"{str(token_addr)[:8]}...{str(token_addr)[-8:]}" if len(str(token_addr)) > 16 else str(token_addr)
-            else:
-                token_display = "N/A"
-            st.write(f"**Token Address:** {token_display}")
+            st.write(f"**Wallet Address:** {shorten_address(selected_transaction_data.get('walletAddress', 'N/A'))}")
+            st.write(f"**Token Address:** {shorten_address(selected_transaction_data.get('tokenAddress', 'N/A'))}")
             
             # Handle bot ID
             bot_id = selected_transaction_data.get('botId', 'N/A')
@@ -224,58 +340,23 @@ def show_bts_info():
         with col1:
             st.markdown("#### 📊 Market Data")
             
-            # Handle coin price formatting using robust data utilities
-            coin_price = safe_numeric_conversion(selected_transaction_data['coinPrice'])
-            coin_price_display = format_crypto_value(coin_price, max_decimals=18)
-            st.write(f"**Current Coin Price:** {coin_price_display}")
-            
-            # Handle dev capital formatting using robust data utilities
-            dev_capital = safe_numeric_conversion(selected_transaction_data['devCapital'])
-            dev_capital_display = format_crypto_value(dev_capital)
-            st.write(f"**Dev Capital:** {dev_capital_display}")
-            
-            # Handle token supply formatting using robust data utilities
-            token_supply = safe_numeric_conversion(selected_transaction_data['tokenSupply'])
-            token_supply_display = f"{token_supply:,.0f}"
-            st.write(f"**Token Supply:** {token_supply_display}")
+            st.write(f"**Current Coin Price:** {format_crypto_value(nums['coinPrice'], max_decimals=18)}")
+            st.write(f"**Dev Capital:** {format_crypto_value(nums['devCapital'])}")
+            st.write(f"**Token Supply:** {nums['tokenSupply']:,.0f}")
         
         with col2:
             st.markdown("#### 🏪 Developer Information")
             
-            # Handle dev pubkey
-            dev_pubkey = selected_transaction_data.get('devPubkey', 'N/A')
-            if pd.notna(dev_pubkey):
-                # Shorten dev pubkey for display
-                dev_pubkey_display = f"{str(dev_pubkey)[:8]}...{str(dev_pubkey)[-8:]}" if len(str(dev_pubkey)) > 16 else str(dev_pubkey)
-            else:
-                dev_pubkey_display = "N/A"
-            st.write(f"**Dev Pubkey:** {dev_pubkey_display}")
-            
-            # Handle dev holder percentage
-            # Handle dev holder percentage formatting using robust data utilities
-            dev_holder_pct = safe_numeric_conversion(selected_transaction_data['devholderPercentage'])
-            dev_holder_pct_display = format_percentage(dev_holder_pct, decimals=6)
-            st.write(f"**Dev Holder %:** {dev_holder_pct_display}")
+            st.write(f"**Dev Pubkey:** {shorten_address(selected_transaction_data.get('devPubkey', 'N/A'))}")
             
-            # Handle total holders supply using robust data utilities
-            total_holders_supply = safe_numeric_conversion(selected_transaction_data['totalHoldersSupply'])
-            total_holders_supply_display = f"{total_holders_supply:,.2f}"
-            st.write(f"**Total Holders Supply:** {total_holders_supply_display}")
+            st.write(f"**Dev Holder %:** {format_percentage(nums['devholderPercentage'], decimals=6)}")
+            st.write(f"**Total Holders Supply:** {nums['totalHoldersSupply']:,.2f}")
         
         with col3:
             st.markdown("#### 🔗 Additional Info")
             
-            # Handle liquidity to mcap ratio
-            # Handle liquidity to mcap ratio using robust data utilities
-            liquidity_ratio = safe_numeric_conversion(selected_transaction_data['liquidityToMcapRatio'])
-            liquidity_ratio_display = f"{liquidity_ratio:.6f}"
-            st.write(f"**Liquidity/MCap Ratio:** {liquidity_ratio_display}")
-            
-            # Handle reserves in SOL
-            # Handle reserves in SOL using robust data utilities
-            reserves_sol = safe_numeric_conversion(selected_transaction_data['reservesInSOL'])
-            reserves_sol_display = f"{reserves_sol:.2f} SOL"
-            st.write(f"**Reserves in SOL:** {reserves_sol_display}")
+            st.write(f"**Liquidity/MCap Ratio:** {nums['liquidityToMcapRatio']:.6f}")
+            st.write(f"**Reserves in SOL:** {nums['reservesInSOL']:.2f} SOL")
             
             # Handle is bundle
             is_bundle = selected_transaction_data.get('isBundle', 'N/A')
@@ -290,21 +371,9 @@ def show_bts_info():
             with col1:
                 st.markdown("#### 📊 Bundle Metrics")
                 
-                # Handle confidence
-                # Handle confidence formatting using robust data utilities
-                confidence = safe_numeric_conversion(selected_transaction_data['confidence'])
-                confidence_display = format_percentage(confidence, decimals=0)
-                st.write(f"**Confidence:** {confidence_display}")
-                
-                # Handle total buyers using robust data utilities
-                total_buyers = safe_numeric_conversion(selected_transaction_data['totalBuyers'])
-                total_buyers_display = f"{total_buyers:,.0f}"
-                st.write(f"**Total Buyers:** {total_buyers_display}")
-                
-                # Handle suspicious buyers using robust data utilities
-                suspicious_buyers = safe_numeric_conversion(selected_transaction_data['suspiciousBuyers'])
-                suspicious_buyers_display = f"{suspicious_buyers:,.0f}"
-                st.write(f"**Suspicious Buyers:** {suspicious_buyers_display}")
+                st.write(f"**Confidence:** {format_percentage(nums['confidence'], decimals=0)}")
+                st.write(f"**Total Buyers:** {nums['totalBuyers']:,.0f}")
+                st.write(f"**Suspicious Buyers:** {nums['suspiciousBuyers']:,.0f}")
             
             with col2:
                 st.markdown("#### 🔍 Bundle Indicators")
@@ -344,23 +413,7 @@ def show_bts_info():
         # Card 4: Profit Calculation Breakdown
         st.markdown("### 💰 Profit Calculation Breakdown")
         with st.container():
-            if all(col in selected_transaction_data for col in ['amount', 'price', 'coinPrice']):
-                # Handle transaction value calculation using robust data utilities
-                amount = safe_numeric_conversion(selected_transaction_data['amount'])
-                price = safe_numeric_conversion(selected_transaction_data['price'])
-                coin_price = safe_numeric_conversion(selected_transaction_data['coinPrice'])
-                
-                transaction_value = safe_calculation(lambda a, p: a * p, amount, price)
-                transaction_value_display = format_crypto_value(transaction_value, max_decimals=18)
-                
-                # Handle current value calculation using robust data utilities
-                current_value = safe_calculation(lambda a, cp: a * cp, amount, coin_price)
-                current_value_display = format_crypto_value(current_value, max_decimals=18)
-                
-                # Handle profit calculation using robust data utilities
-                profit_val = safe_numeric_conversion(selected_transaction_data['profit'])
-                profit_display = format_crypto_value(profit_val, max_decimals=18)
-                
+            if VALUE_SOURCE_COLUMNS.issubset(selected_transaction_data.index):
                 col1, col2, col3 = st.columns(3)
                 with col1:
                     st.metric("Transaction Value", transaction_value_display)
@@ -369,74 +422,11 @@ def show_bts_info():
                 with col3:
                     st.metric("Profit/Loss", profit_display)
         
-        # Card 5: Complete Transaction Data
-        st.markdown("### 📋 Complete Transaction Data")
-        formatted_transaction = selected_transaction_data.copy()
-        
-        # Format numeric columns based on requirements - handle mixed data types
-        for col in formatted_transaction.index:
-            # Get the scalar value from the Series - ensure it's a scalar
-            col_value = formatted_transaction[col]
-            
-            # Convert pandas Series to scalar if needed - more robust approach
-            if hasattr(col_value, 'iloc') and hasattr(col_value, '__len__'):
-                try:
-                    col_value = col_value.iloc[0] if len(col_value) > 0 else None
-                except (IndexError, AttributeError):
-                    col_value = None
-            elif hasattr(col_value, 'item'):
-                # Handle numpy scalars
-                try:
-                    col_value = col_value.item()
-                except (ValueError, AttributeError):
-                    pass
-            
-            # Safe null check function
-            def is_valid_value(val):
-                try:
-                    if val is None:
-                        return False
-                    if hasattr(val, '__len__') and len(val) == 0:
-                        return False
-                    if pd.isna(val):
-                        return False
-                    return True
-                except:
-                    return False
-            
-            if col in ['profit', 'amountInDollars']:
-                # Use robust data utilities for formatting
-                numeric_val = safe_numeric_conversion(col_value)
-                formatted_transaction[col] = format_crypto_value(numeric_val)
-            elif col in ['price', 'coinPrice']:
-                # Use robust data utilities for formatting with high precision
-                numeric_val = safe_numeric_conversion(col_value)
-                formatted_transaction[col] = format_crypto_value(numeric_val, max_decimals=18)
-            elif col == 'timestamp':
-                # Format date/time
-                try:
-                    if is_valid_value(col_value):
-                        formatted_transaction[col] = col_value.strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        formatted_transaction[col] = "N/A"
-                except (AttributeError, TypeError):
-                    formatted_transaction[col] = "N/A"
-            elif isinstance(col_value, (int, float)) and is_valid_value(col_value):
-                # Handle other numeric fields
-                try:
-                    formatted_transaction[col] = f"{col_value:,.0f}"
-                except (ValueError, TypeError):
-                    formatted_transaction[col] = "N/A"
-            else:
-                # Handle string/object fields
-                if is_valid_value(col_value):
-                    formatted_transaction[col] = str(col_value)
-                else:
-                    formatted_transaction[col] = "N/A"
-        
-        # Convert Series to DataFrame for display
-        formatted_df = pd.DataFrame([formatted_transaction])
-        st.dataframe(formatted_df, width='stretch')
+        # Card 5: Complete Transaction Data (collapsed by default)
+        with st.expander("📋 Complete Transaction Data", expanded=False):
+            # Convert Series to DataFrame for display
+            formatted_df = pd.DataFrame([formatted_transaction])
+            st.dataframe(formatted_df, width='stretch')
         
         # Add back button
         if st.button("← Back to Bot Dashboard"):
@@ -448,51 +438,7 @@ def show_bts_info():
         # Card 6: AI Assistant
         st.markdown("### 🤖 AI Assistant")
         with st.container():
-            # Initialize chat history with unique key for this transaction
-            chat_key = f"messages_{selected_transaction_data.get('id', 'unknown')}"
-            if chat_key not in st.session_state:
-                st.session_state[chat_key] = []
-            
-            # Display chat messages from history on app rerun
-            for message in st.session_state[chat_key]:
-                with st.chat_message(message["role"]):
-                    st.markdown(message["content"])
-            
-            # Accept user input
-            if prompt := st.chat_input("Ask about this transaction or token..."):
-                # Add user message to chat history
-                st.session_state[chat_key].append({"role": "user", "content": prompt})
-                
-                # Display user message in chat message container
-                with st.chat_message("user"):
-                    st.markdown(prompt)
-                
-                # Display assistant response in chat message container
-                with st.chat_message("assistant"):
-                    # Give AI all the raw data
-                    context = f"""COMPLETE TRANSACTION DATA (RAW): {selected_transaction_data.to_dict()} TRANSACTION SUMMARY: ( Date/Time: {selected_transaction_data['timestamp']} Transaction ID: {selected_transaction_data['id']} Type: {selected_transaction_data['type']} Amount: {selected_transaction_data['amount']} Price: {selected_transaction_data['price']} Wallet Address: {selected_transaction_data['walletAddress']} Token Address: {selected_transaction_data['tokenAddress']} Profit: {selected_transaction_data['profit']} Current Coin Price: {selected_transaction_data['coinPrice']} Dev Capital: {selected_transaction_data['devCapital']} Bundle Confidence: {selected_transaction_data.get('confidence', 'N/A')})"""
-                    
-                    # Create prompt for Gemini
-                    full_prompt = f"""You are a cryptocurrency trading analyst specializing in sniper bot transactions and bundle detection. Analyze this transaction data and answer the user's question. {context} USER QUESTION: {prompt} Provide a direct, helpful answer based on the data."""
-                    
-                    # Generate response using Gemini (following official docs)
-                    try:
-                        response = client.models.generate_content(
-                            model=GEMINI_CONFIG["model"],
-                            contents=full_prompt
-                        )
-                        response_text = response.text
-                        st.markdown(response_text)
-                        st.session_state[chat_key].append({"role": "assistant", "content": response_text})
-                    except Exception as e:
-                        error_message = f"Sorry, I encountered an error while generating the response: {str(e)}"
-                        st.error(error_message)
-                        st.session_state[chat_key].append({"role": "assistant", "content": error_message})
-            
-            # Add clear chat button
-            if st.button("🗑️ Clear Chat", key=f"clear_chat_{selected_transaction_data.get('id', 'unknown')}"):
-                st.session_state[chat_key] = []
-                st.rerun()
+            render_transaction_chat(selected_transaction_data)
 
 # Run the BTS info page
 show_bts_info()
@@ -1,30 +1,27 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
-from config import DB_CONFIG, CHART_CONFIG
+from config import CHART_CONFIG, APP_CONFIG
+from db_utils import get_engine
 from data_utils import (
-    safe_numeric_conversion, 
+    safe_numeric_series, 
     safe_decimal_conversion, 
     format_crypto_value, 
     format_percentage,
-    safe_calculation,
     validate_dataframe_columns
 )
 
-@st.cache_data
+@st.cache_data(ttl=APP_CONFIG["cache_ttl"], show_spinner=False)
 def load_arb_transaction_data():
     """
     Load arbitrage transaction data from PostgreSQL database.
     """
     try:
-        # Create database connection
-        engine = create_engine(
-            f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@"
-            f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-        )
+        # Reuse the pooled database engine
+        engine = get_engine()
         
         # Load data
         query = "SELECT * FROM arbtransaction"
@@ -36,19 +33,19 @@ def load_arb_transaction_data():
         
         # Calculate idealProfit using the formula: (sellVolume*sellVwap) - (buyVolume*buyVwap)
         if all(col in data.columns for col in ['sellVolume', 'sellVwap', 'buyVolume', 'buyVwap']):
-            # Convert columns to numeric using robust data utilities
-            data['sellVolume'] = data['sellVolume'].apply(lambda x: safe_numeric_conversion(x))
-            data['sellVwap'] = data['sellVwap'].apply(lambda x: safe_numeric_conversion(x))
-            data['buyVolume'] = data['buyVolume'].apply(lambda x: safe_numeric_conversion(x))
-            data['buyVwap'] = data['buyVwap'].apply(lambda x: safe_numeric_conversion(x))
+            # Convert columns to numeric using robust data utilities (missing or invalid values become 0)
+            for col in ['sellVolume', 'sellVwap', 'buyVolume', 'buyVwap']:
+                data[col] = safe_numeric_series(data[col])
             
-            # Calculate idealProfit using safe calculations
-            data['idealProfit'] = data.apply(lambda row: safe_calculation(
-                lambda sv, svwap, bv, bvwap: (sv * svwap) - (bv * bvwap),
-                row['sellVolume'], row['sellVwap'], row['buyVolume'], row['buyVwap']
-            ), axis=1)
+            # Calculate idealProfit on whole columns; non-finite results fall back to 0
+            # The sell and buy totals are the only two arrays allocated; the difference is taken in place
+            raw_profit = np.multiply(data['sellVolume'].to_numpy(), data['sellVwap'].to_numpy())
+            buy_total = np.multiply(data['buyVolume'].to_numpy(), data['buyVwap'].to_numpy())
+            np.subtract(raw_profit, buy_total, out=raw_profit)
+            raw_profit[~np.isfinite(raw_profit)] = 0.0
+            data['idealProfit'] = raw_profit
             
-            data['original_idealProfit'] = original_idealProfit.apply(lambda x: safe_numeric_conversion(x))
+            data['original_idealProfit'] = safe_numeric_series(original_idealProfit)
         else:
             st.warning("Missing required columns for ideal profit calculation: sellVolume, sellVwap, buyVolume, buyVwap")
             data['idealProfit'] = 0
@@ -64,17 +61,14 @@ def load_arb_transaction_data():
         st.error(f"Error loading data: {str(e)}")
         return pd.DataFrame()
 
-@st.cache_data
+@st.cache_data(ttl=APP_CONFIG["bts_cache_ttl"], show_spinner=False)
 def load_bts_transaction_data():
     """
     Load BTS transaction data from PostgreSQL database.
     """
     try:
-        # Create database connection
-        engine = create_engine(
-            f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@"
-            f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-        )
+        # Reuse the pooled database engine
+        engine = get_engine()
         
         # Load data with joins to get complete information
         query = """
@@ -96,17 +90,12 @@ def load_bts_transaction_data():
         data = pd.read_sql(query, engine)
         
         # Convert columns to numeric using robust data utilities
-        data['amount'] = data['amount'].apply(lambda x: safe_numeric_conversion(x))
-        data['price'] = data['price'].apply(lambda x: safe_numeric_conversion(x))
-        data['coinPrice'] = data['coinPrice'].apply(lambda x: safe_numeric_conversion(x))
-        data['amountInDollars'] = data['amountInDollars'].apply(lambda x: safe_numeric_conversion(x))
-        
-        # Calculate profit: (amount * coinPrice) - (amount * price)
-        data['profit'] = data.apply(lambda row: safe_calculation(
-            lambda a, cp, p: (a * cp) - (a * p),
-            row['amount'], row['coinPrice'], row['price']
-        ), axis=1)
+        for col in ['amount', 'price', 'coinPrice', 'amountInDollars']:
+            data[col] = safe_numeric_series(data[col])
         
+        # Calculate profit: amount * (coinPrice - price) on whole columns; non-finite results fall back to 0
+        profit = data['amount'].to_numpy() * (data['coinPrice'].to_numpy() - data['price'].to_numpy())
+        data['profit'] = np.where(np.isfinite(profit), profit, 0.0)
         
         # Convert timestamp to datetime
         if 'timestamp' in data.columns:
@@ -169,9 +158,12 @@ def show_arbitrage_calculations():
         **Display**: Formatted with comma separators, no decimals
         """)
     
-    comparison_data = data[['dateTraded', 'idealProfit', 'original_idealProfit']].copy()
-    comparison_data['difference'] = comparison_data['idealProfit'] - comparison_data['original_idealProfit']
-    comparison_data['match'] = comparison_data['difference'].abs() < 0.01  # Consider values within 0.01 as matching
+    # assign() returns a new frame, so the column selection needs no separate copy
+    difference = data['idealProfit'] - data['original_idealProfit']
+    comparison_data = data[['dateTraded', 'idealProfit', 'original_idealProfit']].assign(
+        difference=difference,
+        match=difference.abs() < 0.01  # Consider values within 0.01 as matching
+    )
     
     # Display raw comparison data
     st.dataframe(comparison_data, width='stretch')
@@ -284,14 +276,12 @@ def show_arbitrage_calculations():
     st.subheader("🕐 SellBase Grouping (20-Minute Windows)")
     
     if 'sellBase' in data.columns:
-        # Create a copy of data for grouping
-        grouped_data = data.copy()
-        
-        # Round dateTraded to nearest 20-minute interval
-        grouped_data['time_window'] = grouped_data['dateTraded'].dt.floor('20min')
+        # Round dateTraded to nearest 20-minute interval, as a grouping key rather
+        # than a new column on a full copy of the data
+        time_window = data['dateTraded'].dt.floor('20min').rename('time_window')
         
         # Group by sellBase and 20-minute time window
-        grouped_results = grouped_data.groupby(['sellBase', 'time_window']).agg({
+        grouped_results = data.groupby([data['sellBase'], time_window]).agg({
             'idealProfit': ['sum', 'count', 'mean'],
             'buyVolume': 'sum',
             'sellVolume': 'sum',
@@ -584,11 +574,8 @@ def show_sniper_calculations():
             
             # Bundle confidence vs profit scatter plot
             # Create absolute profit for size (since size can't be negative)
-            bundle_data_copy = bundle_data.copy()
-            bundle_data_copy['abs_profit'] = bundle_data_copy['profit'].abs()
-            
             fig_bundle = px.scatter(
-                bundle_data_copy,
+                bundle_data.assign(abs_profit=bundle_data['profit'].abs()),
                 x='confidence',
                 y='profit',
                 title='Bundle Confidence vs Profit',
@@ -1,14 +1,38 @@
 import os
-import psycopg2
+from functools import lru_cache
+from pathlib import Path
 from psycopg2.extras import RealDictCursor
-import streamlit as st
+from psycopg2.pool import ThreadedConnectionPool
 import logging
 
+try:
+    import tomllib  # Python 3.11+, C-accelerated
+except ImportError:
+    tomllib = None
+    import toml
+
+# Same lookup order as Streamlit: project .streamlit folder first, then the user's
+SECRETS_PATHS = (
+    Path.cwd() / '.streamlit' / 'secrets.toml',
+    Path(__file__).resolve().parent.parent / '.streamlit' / 'secrets.toml',
+    Path.home() / '.streamlit' / 'secrets.toml',
+)
+
+@lru_cache(maxsize=1)
+def load_secrets():
+    """Parse the first secrets.toml found (once per process)"""
+    for path in SECRETS_PATHS:
+        if path.is_file():
+            if tomllib is not None:
+                return tomllib.loads(path.read_bytes().decode('utf-8'))
+            return toml.load(path)
+    return {}
+
 # Load environment variables from Streamlit secrets
 def get_secret(key, default=None):
-    """Get secret from Streamlit secrets or environment variable"""
+    """Get secret from secrets.toml or environment variable"""
     try:
-        return st.secrets[key]
+        return load_secrets()[key]
     except:
         return os.getenv(key, default)
 
@@ -26,12 +50,13 @@ logger = logging.getLogger(__name__)
 class DatabaseConfig:
     def __init__(self):
         # Use the same DB_CONFIG as the dashboard
+        secrets = get_secret("DB_CONFIG")
         self.db_config = {
-            "host": st.secrets.DB_CONFIG.host,
-            "port": st.secrets.DB_CONFIG.port,
-            "database": st.secrets.DB_CONFIG.database,
-            "user": st.secrets.DB_CONFIG.user,
-            "password": st.secrets.DB_CONFIG.password,
+            "host": secrets["host"],
+            "port": secrets["port"],
+            "database": secrets["database"],
+            "user": secrets["user"],
+            "password": secrets["password"],
             # Add connection parameters for better stability
             "connect_timeout": 60,
             "options": "-c statement_timeout=600000",  # 10 minutes
@@ -45,13 +70,45 @@ class DatabaseConfig:
         self.raw_connection_params = self.db_config
         self.processed_connection_params = self.db_config
 
+        # Pools are created lazily so importing the config never opens a socket
+        self._raw_pool = None
+        self._processed_pool = None
+
+    def _get_raw_pool(self):
+        """Get (and create on first use) the raw data connection pool"""
+        if self._raw_pool is None:
+            self._raw_pool = ThreadedConnectionPool(minconn=1, maxconn=8, **self.raw_connection_params)
+        return self._raw_pool
+
+    def _get_processed_pool(self):
+        """Get (and create on first use) the processed data connection pool"""
+        if self._processed_pool is None:
+            self._processed_pool = ThreadedConnectionPool(minconn=1, maxconn=8, **self.processed_connection_params)
+        return self._processed_pool
+
     def get_raw_connection(self):
-        """Get connection to raw data database"""
-        return psycopg2.connect(**self.raw_connection_params)
+        """Get pooled connection to raw data database"""
+        return self._get_raw_pool().getconn()
 
     def get_processed_connection(self):
-        """Get connection to processed data database"""
-        return psycopg2.connect(**self.processed_connection_params)
+        """Get pooled connection to processed data database"""
+        return self._get_processed_pool().getconn()
+
+    def release_raw_connection(self, conn, discard=False):
+        """Return a raw data connection to its pool (closing it if discard or already closed)"""
+        self._get_raw_pool().putconn(conn, close=discard or bool(conn.closed))
+
+    def release_processed_connection(self, conn, discard=False):
+        """Return a processed data connection to its pool (closing it if discard or already closed)"""
+        self._get_processed_pool().putconn(conn, close=discard or bool(conn.closed))
+
+    def close_pools(self):
+        """Close every connection in both pools (they are recreated on next use)"""
+        for pool in (self._raw_pool, self._processed_pool):
+            if pool is not None and not pool.closed:
+                pool.closeall()
+        self._raw_pool = None
+        self._processed_pool = None
 
     def get_raw_cursor(self):
         """Get cursor for raw data database with RealDictCursor"""
@@ -72,5 +129,5 @@ CONCURRENT_LIMIT = 10
 SCHEMA_NAME = 'processed'
 
 # API Configuration - Using Helius API
-HELIUS_API_KEY = st.secrets.HELIUS_CONFIG.api_key
+HELIUS_API_KEY = get_secret("HELIUS_CONFIG")["api_key"]
 HELIUS_RPC_URL = f"https://rpc.helius.xyz/?api-key={HELIUS_API_KEY}" if HELIUS_API_KEY else None
@@ -13,7 +13,7 @@ import importlib.util
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from .pipeline_config import logger
+from .pipeline_config import db_config, logger
 from .pipeline_utils import setup_processed_schema
 
 # Define available processes
@@ -127,10 +127,14 @@ def main():
         list_processes()
         return
     
-    if args.process == 'all':
-        run_all_processes()
-    else:
-        run_process(args.process)
+    try:
+        if args.process == 'all':
+            run_all_processes()
+        else:
+            run_process(args.process)
+    finally:
+        # Close the pooled database connections
+        db_config.close_pools()
 
 if __name__ == "__main__":
     import asyncio
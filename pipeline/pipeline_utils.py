@@ -4,6 +4,7 @@ import hashlib
 import logging
 from datetime import datetime
 import time
+from functools import lru_cache
 from psycopg2.extras import RealDictCursor
 
 # Add the pipeline directory to the path
@@ -16,11 +17,9 @@ def setup_processed_schema():
     cursor, conn = db_config.get_processed_cursor()
     
     try:
-        # Create schema if it doesn't exist
-        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA_NAME}")
-        
-        # Create pipeline tracker table
+        # Create schema and pipeline tracker table in a single round-trip
         cursor.execute(f"""
+            CREATE SCHEMA IF NOT EXISTS {SCHEMA_NAME};
             CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.pipeline_tracker (
                 table_name VARCHAR(255) PRIMARY KEY,
                 last_processed_id BIGINT DEFAULT 0,
@@ -37,7 +36,7 @@ def setup_processed_schema():
         raise
     finally:
         cursor.close()
-        conn.close()
+        db_config.release_processed_connection(conn)
 
 def get_last_processed_id(table_name):
     """Get the last processed ID for a table"""
@@ -58,22 +57,34 @@ def get_last_processed_id(table_name):
         return 0
     finally:
         cursor.close()
-        conn.close()
+        db_config.release_processed_connection(conn)
 
-def update_pipeline_tracker(table_name, last_id):
-    """Update the pipeline tracker with the last processed ID"""
+@lru_cache(maxsize=256)
+def get_table_columns(schema_name, table_name):
+    """Get the column names of a table (cached per process, the schema doesn't change mid-run)"""
     cursor, conn = db_config.get_processed_cursor()
     
     try:
-        # First check what columns exist in the pipeline_tracker table
-        cursor.execute(f"""
+        cursor.execute("""
             SELECT column_name 
             FROM information_schema.columns 
             WHERE table_schema = %s 
-            AND table_name = 'pipeline_tracker'
-        """, (SCHEMA_NAME,))
+            AND table_name = %s
+            ORDER BY ordinal_position
+        """, (schema_name, table_name))
         
-        columns = [row['column_name'] for row in cursor.fetchall()]
+        return tuple(row['column_name'] for row in cursor.fetchall())
+    finally:
+        cursor.close()
+        db_config.release_processed_connection(conn)
+
+def update_pipeline_tracker(table_name, last_id):
+    """Update the pipeline tracker with the last processed ID"""
+    cursor, conn = db_config.get_processed_cursor()
+    
+    try:
+        # First check what columns exist in the pipeline_tracker table
+        columns = get_table_columns(SCHEMA_NAME, 'pipeline_tracker')
         
         # Use the appropriate query based on existing columns
         if 'last_updated' in columns:
@@ -115,7 +126,7 @@ def update_pipeline_tracker(table_name, last_id):
         raise
     finally:
         cursor.close()
-        conn.close()
+        db_config.release_processed_connection(conn)
 
 def generate_row_hash(data_dict):
     """Generate a hash for a row of data"""
@@ -168,6 +179,7 @@ def create_table_if_not_exists(table_name, columns_definition, max_retries=3, re
     for attempt in range(max_retries):
         cursor = None
         conn = None
+        failed = False
         
         try:
             conn = db_config.get_processed_connection()
@@ -189,24 +201,28 @@ def create_table_if_not_exists(table_name, columns_definition, max_retries=3, re
                 return
             
             # Create table if it doesn't exist
-            cursor.execute(f"""
+            statements = [f"""
                 CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.{table_name} (
                     {columns_definition}
                 )
-            """)
+            """]
             
             # Create unique index on row_hash if it exists in the columns definition
             if 'row_hash' in columns_definition.lower():
-                cursor.execute(f"""
+                statements.append(f"""
                     CREATE UNIQUE INDEX IF NOT EXISTS idx_{table_name}_row_hash 
                     ON {SCHEMA_NAME}.{table_name} (row_hash)
                 """)
             
+            # Send the DDL as one batch so it costs a single round-trip
+            cursor.execute(";".join(statements))
+            
             conn.commit()
             logger.info(f"✅ Table {SCHEMA_NAME}.{table_name} created/verified")
             return  # Success, exit retry loop
             
         except Exception as e:
+            failed = True
             if cursor and conn:
                 try:
                     conn.rollback()
@@ -229,7 +245,7 @@ def create_table_if_not_exists(table_name, columns_definition, max_retries=3, re
                     pass
             if conn:
                 try:
-                    conn.close()
+                    db_config.release_processed_connection(conn, discard=failed)
                 except:
                     pass
 
@@ -242,9 +258,10 @@ def batch_insert_with_retry(table_name, data_list, columns, max_retries=3, retry
     for attempt in range(max_retries):
         cursor = None
         conn = None
+        failed = False
         
         try:
-            # Get fresh connection for each attempt
+            # Get a pooled connection for each attempt (failed ones are discarded)
             conn = db_config.get_processed_connection()
             cursor = conn.cursor(cursor_factory=RealDictCursor)
             
@@ -272,6 +289,7 @@ def batch_insert_with_retry(table_name, data_list, columns, max_retries=3, retry
             return  # Success, exit retry loop
             
         except Exception as e:
+            failed = True
             if cursor and conn:
                 try:
                     conn.rollback()
@@ -294,7 +312,7 @@ def batch_insert_with_retry(table_name, data_list, columns, max_retries=3, retry
                     pass
             if conn:
                 try:
-                    conn.close()
+                    db_config.release_processed_connection(conn, discard=failed)
                 except:
                     pass
 
@@ -310,12 +328,14 @@ def fetch_data_with_pagination(raw_table, last_id, batch_size, additional_where=
     for attempt in range(max_retries):
         cursor = None
         conn = None
+        failed = False
         
         try:
             conn = db_config.get_raw_connection()
             cursor = conn.cursor(cursor_factory=RealDictCursor)
             
-            where_clause = f"WHERE id > {last_id}"
+            # Bind the id cursor and batch size so Postgres can reuse the plan
+            where_clause = "WHERE id > %s"
             if additional_where:
                 where_clause += f" AND {additional_where}"
             
@@ -323,15 +343,16 @@ def fetch_data_with_pagination(raw_table, last_id, batch_size, additional_where=
                 SELECT * FROM {raw_table} 
                 {where_clause}
                 ORDER BY id ASC 
-                LIMIT {batch_size}
+                LIMIT %s
             """
             
-            cursor.execute(query)
+            cursor.execute(query, (last_id, batch_size))
             rows = cursor.fetchall()
             
             return [dict(row) for row in rows]
             
         except Exception as e:
+            failed = True
             if attempt < max_retries - 1:
                 logger.warning(f"⚠️ Attempt {attempt + 1} failed fetching from {raw_table}: {e}")
                 logger.info(f"🔄 Retrying in {retry_delay} seconds...")
@@ -348,6 +369,6 @@ def fetch_data_with_pagination(raw_table, last_id, batch_size, additional_where=
                     pass
             if conn:
                 try:
-                    conn.close()
+                    db_config.release_raw_connection(conn, discard=failed)
                 except:
                     pass
@@ -11,7 +11,7 @@ import asyncio
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from pipeline_config import logger
+from pipeline_config import db_config, logger
 from pipeline_utils import setup_processed_schema
 
 def run_clean_bts_coin_info():
@@ -57,6 +57,9 @@ def main():
     except Exception as e:
         logger.error(f"❌ Pipeline failed: {e}")
         raise
+    finally:
+        # Close the pooled database connections
+        db_config.close_pools()
 
 if __name__ == "__main__":
     main()